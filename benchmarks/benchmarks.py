@@ -0,0 +1,115 @@
+"""Benchmarks of reading SWMM 5 binary output, in the style of asv.
+
+Run with "asv run" from the repository root, or without asv with::
+
+    python -m benchmarks.benchmarks
+
+The synthetic output files are written once into a temporary directory.
+The size of the "large" model can be scaled with the environment variable
+"SWMMTOOLBOX_BENCH_SCALE", for example "SWMMTOOLBOX_BENCH_SCALE=10" for a
+model with 10 times the elements and periods.
+"""
+
+import functools
+import os
+import shutil
+import tempfile
+import timeit
+
+from swmmtoolbox.swmmtoolbox import SwmmExtract, catalog, clear_pool, extract
+
+from .synthetic import write_synthetic_out
+
+SCALE = float(os.environ.get("SWMMTOOLBOX_BENCH_SCALE", "1"))
+
+# (nsubcatch, nnodes, nlinks, npolluts, nperiods) for each model size.
+MODELS = {
+    "small": (10, 50, 50, 1, 1000),
+    "large": (
+        int(1000 * SCALE),
+        int(5000 * SCALE),
+        int(5000 * SCALE),
+        2,
+        int(2000 * SCALE),
+    ),
+}
+
+
+def _write_models():
+    """Write one synthetic output file per model size."""
+    tmpdir = tempfile.mkdtemp(prefix="swmmtoolbox_bench_")
+    filenames = {}
+    for size, (nsubcatch, nnodes, nlinks, npolluts, nperiods) in MODELS.items():
+        filenames[size] = os.path.join(tmpdir, f"{size}.out")
+        write_synthetic_out(
+            filenames[size],
+            nsubcatch=nsubcatch,
+            nnodes=nnodes,
+            nlinks=nlinks,
+            npolluts=npolluts,
+            nperiods=nperiods,
+        )
+    return filenames
+
+
+class SwmmBenchmarks:
+    """Header parsing, catalog, and extraction for each model size."""
+
+    params = ("small", "large")
+    param_names = ("model",)
+    timeout = 600
+    # Time one cold call per sample.  The reader pool would otherwise reuse
+    # the parsed header and dates of the previous call.
+    number = 1
+    warmup_time = 0
+
+    def setup_cache(self):
+        return _write_models()
+
+    def setup(self, filenames, model):
+        clear_pool()
+
+    def time_header_open(self, filenames, model):
+        with SwmmExtract(filenames[model], cache=False):
+            pass
+
+    def time_header_parse(self, filenames, model):
+        # The header sections are read lazily, so read all of them.
+        with SwmmExtract(filenames[model], cache=False) as obj:
+            obj._read_header()
+
+    def time_catalog(self, filenames, model):
+        catalog(filenames[model])
+
+    def time_extract_single_label(self, filenames, model):
+        extract(filenames[model], "node,J1,Hydraulic_head")
+
+    def time_extract_wildcard_label(self, filenames, model):
+        extract(filenames[model], "link,,Flow_rate")
+
+    def time_extract_full_dump(self, filenames, model):
+        extract(filenames[model], ",,")
+
+    def peakmem_extract_wildcard_label(self, filenames, model):
+        extract(filenames[model], "link,,Flow_rate")
+
+
+def main():
+    """Time each benchmark once without asv."""
+    bench = SwmmBenchmarks()
+    filenames = bench.setup_cache()
+    try:
+        for model in bench.params:
+            for name in sorted(dir(bench)):
+                if not name.startswith("time_"):
+                    continue
+                func = functools.partial(getattr(bench, name), filenames, model)
+                bench.setup(filenames, model)
+                seconds = timeit.timeit(func, number=1)
+                print(f"{model:>6} {name:<32} {seconds:10.4f} s")
+    finally:
+        shutil.rmtree(os.path.dirname(filenames["small"]), ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""Write synthetic SWMM 5 binary output files for benchmarks.
+
+The files have the same layout as the output of a SWMM 5 run with the
+requested number of subcatchments, nodes, links, pollutants, and time
+periods, and random values in the results block.
+"""
+
+import numpy as np
+
+from swmmtoolbox.swmmtoolbox import SwmmWriter
+
+# Number of variables for subcatchments, nodes, links, and the system,
+# before adding one variable per pollutant to the first three.
+NVARS = {"subcatchment": 8, "node": 6, "link": 5, "system": 15}
+
+
+def write_synthetic_out(
+    filename,
+    nsubcatch=10,
+    nnodes=10,
+    nlinks=10,
+    npolluts=0,
+    nperiods=100,
+    reportinterval=300,
+    startdate=41232.0,
+    version=51015,
+    chunksize=1024,
+    seed=0,
+):
+    """Write a valid SWMM 5 binary output file with random results.
+
+    The results block is written "chunksize" periods at a time so that
+    files much larger than memory can be created.
+    """
+    rng = np.random.default_rng(seed)
+    names = {
+        0: [f"S{i}" for i in range(nsubcatch)],
+        1: [f"J{i}" for i in range(nnodes)],
+        2: [f"C{i}" for i in range(nlinks)],
+        3: [f"P{i}" for i in range(npolluts)],
+    }
+    variables = {
+        0: list(range(NVARS["subcatchment"] + npolluts)),
+        1: list(range(NVARS["node"] + npolluts)),
+        2: list(range(NVARS["link"] + npolluts)),
+        4: list(range(NVARS["system"])),
+    }
+
+    # Subcatchment area, node type, invert, and max depth, and link type,
+    # offsets, max depth, and length.
+    subcatch_props = rng.uniform(1, 100, (nsubcatch, 1))
+    node_props = np.zeros((nnodes, 3), dtype="f4")
+    node_props[:, 1] = rng.uniform(0, 500, nnodes)
+    node_props[:, 2] = rng.uniform(1, 10, nnodes)
+    link_props = np.zeros((nlinks, 5), dtype="f4")
+    link_props[:, 3] = rng.uniform(0.5, 5, nlinks)
+    link_props[:, 4] = rng.uniform(10, 1000, nlinks)
+    prop = {
+        0: subcatch_props,
+        1: node_props,
+        2: link_props,
+    }
+
+    with SwmmWriter(
+        filename,
+        names,
+        variables,
+        startdate,
+        reportinterval,
+        propcode={0: [1], 1: [0, 2, 3], 2: [0, 4, 4, 3, 5]},
+        prop=prop,
+        version=version,
+    ) as writer:
+        for first in range(0, nperiods, chunksize):
+            count = min(chunksize, nperiods - first)
+            writer.write(rng.random((count, writer.nvalues), dtype="f4"))
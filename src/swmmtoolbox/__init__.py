@@ -1,2 +1,40 @@
-__all__ = ["catalog", "listdetail", "listvariables", "stdtoswmm5", "extract"]
-from .swmmtoolbox import catalog, extract, listdetail, listvariables, stdtoswmm5
+__all__ = [
+    "catalog",
+    "clear_pool",
+    "convert",
+    "listdetail",
+    "listvariables",
+    "snapshot",
+    "stdtoswmm5",
+    "subset",
+    "summarize",
+    "extract",
+    "extract_async",
+    "extract_chunks",
+    "extract_ensemble",
+    "extract_many_async",
+    "follow",
+    "iter_frames",
+    "AsyncSwmmExtract",
+    "SwmmWriter",
+]
+from .swmmtoolbox import (
+    AsyncSwmmExtract,
+    SwmmWriter,
+    catalog,
+    clear_pool,
+    convert,
+    extract,
+    extract_async,
+    extract_chunks,
+    extract_ensemble,
+    extract_many_async,
+    follow,
+    iter_frames,
+    listdetail,
+    listvariables,
+    snapshot,
+    stdtoswmm5,
+    subset,
+    summarize,
+)
@@ -1,19 +1,52 @@
 # Example package with a console entry point
 """Reads and formats data from the SWMM 5 output file."""
 
+import asyncio
+import collections
 import copy
 import csv
 import datetime
+import functools
+import glob
+import hashlib
+import io
+import itertools
+import json
+import math
 import os
 import struct
 import sys
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from contextlib import suppress
 
+import numpy as np
 import pandas as pd
 
 from .toolbox_utils.src.toolbox_utils import tsutils
 
-__all__ = ["about", "catalog", "listdetail", "listvariables", "stdtoswmm5", "extract"]
+__all__ = [
+    "about",
+    "catalog",
+    "clear_pool",
+    "convert",
+    "listdetail",
+    "listvariables",
+    "snapshot",
+    "stdtoswmm5",
+    "subset",
+    "summarize",
+    "extract",
+    "extract_async",
+    "extract_chunks",
+    "extract_ensemble",
+    "extract_many_async",
+    "follow",
+    "iter_frames",
+    "AsyncSwmmExtract",
+    "SwmmWriter",
+]
 
 PROPCODE = {
     0: {1: "Area"},
@@ -123,7 +156,12 @@ _SWMM_FLOWUNITS = {0: "CFS", 1: "GPM", 2: "MGD", 3: "CMS", 4: "LPS", 5: "LPD"}
 _LOCAL_DOCSTRINGS = tsutils.docstrings
 _LOCAL_DOCSTRINGS["filename"] = """filename : str
         Filename of SWMM output file.  The SWMM model must complete
-        successfully for "swmmtoolbox" to correctly read it.
+        successfully for "swmmtoolbox" to correctly read it.  Can also be
+        a directory written by "swmmtoolbox convert".
+
+        In Python can also be an open "SwmmExtract" instance, a binary file
+        object, or the bytes of an output file, so that one parsed reader
+        can serve many calls.
         """
 _LOCAL_DOCSTRINGS["itemtype"] = """itemtype : str
         One of 'system', 'node', 'link', or 'pollutant' to identify the
@@ -159,6 +197,48 @@ _LOCAL_DOCSTRINGS["labels"] = """labels : str
 
         """
 
+_LOCAL_DOCSTRINGS["stride"] = """stride : int
+        [optional, default is 1]
+
+        Only return every "stride" time period, starting with the first time
+        period on or after "start_date".  The skipped time periods are not
+        read from the output file.
+        """
+
+_LOCAL_DOCSTRINGS["chunksize"] = """chunksize : int
+        [optional, default is None]
+
+        Number of time periods to read and return at a time.  For the
+        Python API the default of None sizes the blocks to about 64 MB of
+        the output file.  On the command line, setting "chunksize" streams
+        the output so that only "chunksize" time periods are in memory.
+        """
+
+_LOCAL_DOCSTRINGS["output_format"] = """output_format : str
+        [optional, default is "csv"]
+
+        One of "csv", "parquet", "feather", or "npz".  The "parquet" and
+        "feather" (Arrow IPC) formats need the optional "pyarrow" package
+        and time series are written a block of periods at a time.  The
+        "npz" format is a compressed numpy file of named arrays, "dates",
+        "values", and "columns" for time series and "TYPE", "NAME", and
+        "VARIABLE" for the catalog.  All formats except "csv" require
+        "output".
+        """
+
+_LOCAL_DOCSTRINGS["output"] = """output : str
+        [optional, default is None]
+
+        Filename to write to instead of printing to stdout.
+        """
+
+_LOCAL_DOCSTRINGS["workers"] = """workers : int
+        [optional, default is None]
+
+        Number of workers used to read the output file in parallel.  The
+        default of None reads serially.  The result is identical either way.
+        """
+
 
 def tuple_search(findme, haystack):
     """Partial search of list of tuples.
@@ -184,13 +264,166 @@ def tuple_search(findme, haystack):
     return match
 
 
+# Header attributes that are plain numbers in the metadata cache.
+_CACHED_COUNTS = (
+    "version",
+    "swmm_flowunits",
+    "swmm_nsubcatch",
+    "swmm_nnodes",
+    "swmm_nlinks",
+    "swmm_npolluts",
+    "swmm_nsubcatchvars",
+    "nnodevars",
+    "nlinkvars",
+    "nsystemvars",
+    "bytesperperiod",
+)
+
+# Increment when the layout of the metadata cache changes.
+_CACHE_VERSION = 3
+
+
+def _cache_filename(filename, cache=None):
+    """Return the metadata cache filename for "filename" or None."""
+    if cache is None:
+        cache = os.environ.get("SWMMTOOLBOX_CACHE", "")
+    if cache in (False, "", "0"):
+        return None
+    if cache is True or cache == "sidecar":
+        return f"{filename}.swmmtoolbox.json"
+    try:
+        os.makedirs(cache, exist_ok=True)
+    except OSError:
+        # The cache is optional, so an unusable directory means no cache.
+        return None
+    abspath = os.path.abspath(filename)
+    digest = hashlib.sha1(abspath.encode("utf-8")).hexdigest()
+    return os.path.join(cache, f"{digest}.json")
+
+
+def _cache_key(filename, footer):
+    """Everything that must match for a metadata cache to be current."""
+    stat = os.stat(filename)
+    return [
+        _CACHE_VERSION,
+        os.path.abspath(filename),
+        stat.st_size,
+        stat.st_mtime_ns,
+        list(footer),
+    ]
+
+
+def _decode_dates(rdates):
+    """Convert SWMM float64 dates to a pandas DatetimeIndex.
+
+    SWMM stores dates as days since 1899-12-30, so the seconds are rounded to
+    correct the +/- 1 second representation error.
+    """
+    rdates = np.array(rdates, dtype="f8")
+    days = np.trunc(rdates)
+    seconds = ((rdates - days) * 86400).astype("int64")
+    extra = seconds % 10
+    seconds[extra == 1] -= 1
+    seconds[extra == 9] += 1
+    return pd.DatetimeIndex(
+        pd.Timestamp(1899, 12, 30)
+        + pd.to_timedelta(days.astype("int64"), unit="D")
+        + pd.to_timedelta(seconds, unit="s")
+    )
+
+
+def _results_memmap(filename, startpos, nperiods, bytesperperiod):
+    """Memory map the results block of a SWMM output file."""
+    nvalues = (bytesperperiod - 8) // 4
+    return np.memmap(
+        filename,
+        dtype=np.dtype([("date", "f8"), ("values", "f4", (nvalues,))]),
+        mode="r",
+        offset=startpos,
+        shape=(nperiods,),
+    )
+
+
+def _read_values_block(layout, columns, periods):
+    """Read "columns" for the "periods" range in a worker.
+
+    The "layout" is (filename, startpos, nperiods, bytesperperiod) so that
+    each worker maps the file itself without parsing the header again.
+    """
+    return _take_values_block(_results_memmap(*layout)["values"], columns, periods)
+
+
+def _take_values_block(results, columns, periods):
+    """Copy "columns" for the "periods" range from the "values" of results."""
+    return np.array(results[periods.start : periods.stop : periods.step][:, columns])
+
+
+class _LazyIndex(dict):
+    """Dictionary that builds the value for a key on first access."""
+
+    def __init__(self, factory):
+        super().__init__()
+        self.factory = factory
+
+    def __missing__(self, key):
+        value = self[key] = self.factory(key)
+        return value
+
+
 class SwmmExtract:
     """The class that handles all extraction of data from the out file."""
 
-    def __init__(self, filename):
+    def __init__(self, filename, cache=None):
+        """Open the SWMM output file and read the header.
+
+        Parameters
+        ----------
+        filename : str
+            Filename of SWMM output file.  Can also be a binary file object
+            or the bytes of an output file.
+        cache : bool or str
+            [optional, default is None]
+
+            Where to keep a metadata cache so that re-opening an unchanged
+            output file skips parsing the header.  True writes a sidecar
+            file next to the output file, a string is a directory for the
+            cache files, and False disables caching.  None uses the
+            "SWMMTOOLBOX_CACHE" environment variable, which can be a
+            directory or "sidecar", and disables caching if not set.
+        """
         self.record_size = 4
-        self.fpb = open(filename, "rb")
+        self._results = None
+        self._dates = None
+        self._lock = threading.RLock()
+        # The path is only known when opened from a filename, otherwise the
+        # results block is read from the buffer or the file object.
+        self._path = None
+        self._buffer = None
+        self._owns_file = False
+        if isinstance(filename, (str, os.PathLike)):
+            self._path = os.fspath(filename)
+            self.filename = self._path
+            self.fpb = open(filename, "rb")
+            self._owns_file = True
+        elif isinstance(filename, (bytes, bytearray, memoryview)):
+            self.filename = None
+            self._buffer = memoryview(filename)
+            self.fpb = io.BytesIO(filename)
+        else:
+            self.filename = getattr(filename, "name", None)
+            if isinstance(filename, io.BytesIO):
+                self._buffer = filename.getbuffer()
+            self.fpb = filename
+        try:
+            self._read_prologue(cache)
+        except BaseException:
+            self.close()
+            raise
+
+    def _read_prologue(self, cache):
+        """Check the footer and read the counts at the start of the file."""
         self.fpb.seek(-6 * self.record_size, 2)
+        footer = struct.unpack("6i", self.fpb.read(6 * self.record_size))
         (
             self.names_start_pos,
             self.offset0,
@@ -198,7 +431,7 @@ class SwmmExtract:
             self.swmm_nperiods,
             errcode,
             magic2,
-        ) = struct.unpack("6i", self.fpb.read(6 * self.record_size))
+        ) = footer
 
         self.fpb.seek(0, 0)
         magic1 = struct.unpack("i", self.fpb.read(self.record_size))[0]
@@ -237,22 +470,77 @@ class SwmmExtract:
                 )
             )
 
-        # --- otherwise read additional parameters from start of file
+        # Only the counts at the start of the file are read here, the other
+        # header sections are read the first time they are needed.
         (
-            version,
+            self.version,
             self.swmm_flowunits,
             self.swmm_nsubcatch,
             self.swmm_nnodes,
             self.swmm_nlinks,
             self.swmm_npolluts,
         ) = struct.unpack("6i", self.fpb.read(6 * self.record_size))
-
-        varcode = VARCODE_OLD if version < 5100 else VARCODE
         self.itemlist = ["subcatchment", "node", "link", "pollutant", "system"]
 
-        # Read in the names
-        self.fpb.seek(self.names_start_pos, 0)
-        self.names = {0: [], 1: [], 2: [], 3: [], 4: []}
+        cachefile = None
+        if self._path is not None:
+            cachefile = _cache_filename(self._path, cache)
+        if cachefile is not None:
+            cachekey = _cache_key(self._path, footer)
+            if not self._load_cache(cachefile, cachekey):
+                self._read_header()
+                self._save_cache(cachefile, cachekey)
+
+    def close(self):
+        """Close the output file.
+
+        Arrays already returned from the memory mapped results block stay
+        valid.  A file object passed in by the caller is left open.
+        """
+        if self._owns_file and self.fpb is not None:
+            self.fpb.close()
+        self._results = None
+
+    @property
+    def closed(self):
+        """True if the output file was closed."""
+        return self.fpb is not None and self.fpb.closed
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def __del__(self):
+        # Readers dropped from the pool are closed when no longer used.
+        if getattr(self, "_owns_file", False):
+            self.close()
+
+    def _read_header(self):
+        """Read all of the header sections."""
+        for attr in ("names", "pollutant_codes", "varcode", "prop", "vars"):
+            getattr(self, attr)
+
+    def _read_block(self, start, stop):
+        """Read the bytes from "start" to "stop" with one call.
+
+        The seek and read are locked so that threads can share an instance.
+        """
+        with self._lock:
+            self.fpb.seek(start, 0)
+            return self.fpb.read(stop - start)
+
+    @functools.cached_property
+    def _id_section(self):
+        """Parse the names and pollutant codes.
+
+        The section from "names_start_pos" to "offset0" is read in one call
+        and parsed from the buffer.
+        """
+        buffer = self._read_block(self.names_start_pos, self.offset0)
+        pos = 0
+        names = {0: [], 1: [], 2: [], 3: []}
         number_list = [
             self.swmm_nsubcatch,
             self.swmm_nnodes,
@@ -260,128 +548,150 @@ class SwmmExtract:
             self.swmm_npolluts,
         ]
         for i, j in enumerate(number_list):
+            collect_names = names[i]
             for _ in range(j):
-                stringsize = struct.unpack("i", self.fpb.read(self.record_size))[0]
-                self.names[i].append(
-                    struct.unpack(f"{stringsize}s", self.fpb.read(stringsize))[0]
-                )
-
-        for key, value in self.names.items():
-            collect_names = []
-            for name in value:
+                stringsize = int.from_bytes(buffer[pos : pos + 4], "little")
+                pos += 4
                 # Why would SWMM allow spaces in names?  Anyway...
-                try:
-                    rname = str(name, "ascii", "replace")
-                except TypeError:
-                    rname = name.decode("ascii", "replace")
-                try:
-                    collect_names.append(rname.decode())
-                except AttributeError:
-                    collect_names.append(rname)
-            self.names[key] = collect_names
-
-        # Update self.varcode to add pollutant names to subcatchment,
-        # nodes, and links.
-        self.varcode = copy.deepcopy(varcode)
-        for itemtype in ("subcatchment", "node", "link"):
-            typenumber = self.type_check(itemtype)
-            start = len(varcode[typenumber])
-            end = start + len(self.names[3])
-            nlabels = list(range(start, end))
-            ndict = dict(list(zip(nlabels, self.names[3])))
-            self.varcode[typenumber].update(ndict)
+                collect_names.append(
+                    buffer[pos : pos + stringsize].decode("ascii", "replace")
+                )
+                pos += stringsize
 
         # Read pollutant concentration codes
         # = Number of pollutants * 4 byte integers
-        self.pollutant_codes = struct.unpack(
-            f"{self.swmm_npolluts}i",
-            self.fpb.read(self.swmm_npolluts * self.record_size),
-        )
-
-        self.propcode = {}
-
-        # self.prop[0] contain property codes and values for
-        # subcatchments
-        # self.prop[1] contain property codes and values for nodes
-        # self.prop[2] contain property codes and values for links
-        self.prop = {0: [], 1: [], 2: []}
-
-        # subcatchments
-        nsubprop = struct.unpack("i", self.fpb.read(self.record_size))[0]
-        self.propcode[0] = struct.unpack(
-            f"{nsubprop}i", self.fpb.read(nsubprop * self.record_size)
+        pollutant_codes = np.frombuffer(
+            buffer, dtype="i4", count=self.swmm_npolluts, offset=pos
         )
-        for i in range(self.swmm_nsubcatch):
-            rprops = struct.unpack(
-                f"{nsubprop}f", self.fpb.read(nsubprop * self.record_size)
-            )
-            self.prop[0].append(list(zip(self.propcode[0], rprops)))
+        return (names, tuple(pollutant_codes.tolist()))
 
-        # nodes
-        nnodeprop = struct.unpack("i", self.fpb.read(self.record_size))[0]
-        self.propcode[1] = struct.unpack(
-            f"{nnodeprop}i", self.fpb.read(nnodeprop * self.record_size)
-        )
-        for i in range(self.swmm_nnodes):
-            rprops = struct.unpack(
-                f"{nnodeprop}f", self.fpb.read(nnodeprop * self.record_size)
-            )
-            self.prop[1].append(list(zip(self.propcode[1], rprops)))
+    @functools.cached_property
+    def _variables_section(self):
+        """Parse the reporting variables, start date, and report interval.
 
-        # links
-        nlinkprop = struct.unpack("i", self.fpb.read(self.record_size))[0]
-        self.propcode[2] = struct.unpack(
-            f"{nlinkprop}i", self.fpb.read(nlinkprop * self.record_size)
-        )
-        for i in range(self.swmm_nlinks):
-            rprops = struct.unpack(
-                f"{nlinkprop}f", self.fpb.read(nlinkprop * self.record_size)
+        The property tables are skipped by reading only the number of
+        properties for each type.
+        """
+        pos = self.offset0
+        for count in (self.swmm_nsubcatch, self.swmm_nnodes, self.swmm_nlinks):
+            nprop = struct.unpack("i", self._read_block(pos, pos + self.record_size))[0]
+            pos += self.record_size * (1 + nprop + count * nprop)
+        vars_pos = pos
+
+        buffer = self._read_block(vars_pos, self.startpos)
+        pos = 0
+        variables = {}
+        for typenumber in (0, 1, 2, 4):
+            nvars = struct.unpack_from("i", buffer, pos)[0]
+            pos += self.record_size
+            variables[typenumber] = tuple(
+                np.frombuffer(buffer, dtype="i4", count=nvars, offset=pos).tolist()
             )
-            self.prop[2].append(list(zip(self.propcode[2], rprops)))
-
-        self.vars = {}
-        self.swmm_nsubcatchvars = struct.unpack("i", self.fpb.read(self.record_size))[0]
-        self.vars[0] = struct.unpack(
-            f"{self.swmm_nsubcatchvars}i",
-            self.fpb.read(self.swmm_nsubcatchvars * self.record_size),
-        )
+            pos += nvars * self.record_size
 
-        self.nnodevars = struct.unpack("i", self.fpb.read(self.record_size))[0]
-        self.vars[1] = struct.unpack(
-            f"{self.nnodevars}i",
-            self.fpb.read(self.nnodevars * self.record_size),
-        )
-
-        self.nlinkvars = struct.unpack("i", self.fpb.read(self.record_size))[0]
-        self.vars[2] = struct.unpack(
-            f"{self.nlinkvars}i",
-            self.fpb.read(self.nlinkvars * self.record_size),
+        startdate = struct.unpack_from("d", buffer, pos)[0]
+        pos += 2 * self.record_size
+        days = int(startdate)
+        seconds = (startdate - days) * 86400
+        startdate = datetime.datetime(1899, 12, 30) + datetime.timedelta(
+            days=days, seconds=seconds
         )
 
-        self.vars[3] = [0]
+        reportinterval = struct.unpack_from("i", buffer, pos)[0]
+        reportinterval = datetime.timedelta(seconds=reportinterval)
+        return (vars_pos, variables, startdate, reportinterval)
 
-        self.nsystemvars = struct.unpack("i", self.fpb.read(self.record_size))[0]
-        self.vars[4] = struct.unpack(
-            f"{self.nsystemvars}i",
-            self.fpb.read(self.nsystemvars * self.record_size),
-        )
+    @functools.cached_property
+    def _property_section(self):
+        """Parse the property codes and property tables.
 
+        self.propcode[0], self.prop[0] are the property codes and the
+        (nsubcatch, nprop) float32 array of property values for
+        subcatchments, [1] for nodes, and [2] for links.
+        """
+        buffer = self._read_block(self.offset0, self._variables_section[0])
+        pos = 0
+        propcode = {}
+        prop = {}
+        for typenumber, count in enumerate(
+            (self.swmm_nsubcatch, self.swmm_nnodes, self.swmm_nlinks)
+        ):
+            nprop = struct.unpack_from("i", buffer, pos)[0]
+            pos += self.record_size
+            propcode[typenumber] = tuple(
+                np.frombuffer(buffer, dtype="i4", count=nprop, offset=pos).tolist()
+            )
+            pos += nprop * self.record_size
+            prop[typenumber] = np.frombuffer(
+                buffer, dtype="f4", count=count * nprop, offset=pos
+            ).reshape(count, nprop)
+            pos += count * nprop * self.record_size
+        return (propcode, prop)
+
+    @functools.cached_property
+    def names(self):
+        """Names of subcatchments, nodes, links, pollutants, and system vars."""
+        names = dict(self._id_section[0])
         # System vars do not have names per se, but made names = number labels
-        self.names[4] = [self.varcode[4][i] for i in self.vars[4]]
-
-        self.startdate = struct.unpack("d", self.fpb.read(2 * self.record_size))[0]
-        days = int(self.startdate)
-        seconds = (self.startdate - days) * 86400
-        self.startdate = datetime.datetime(1899, 12, 30) + datetime.timedelta(
-            days=days, seconds=seconds
-        )
-
-        self.reportinterval = struct.unpack("i", self.fpb.read(self.record_size))[0]
-        self.reportinterval = datetime.timedelta(seconds=self.reportinterval)
-
-        # Calculate the bytes for each time period when
-        # reading the computed results
-        self.bytesperperiod = self.record_size * (
+        names[4] = [self._base_varcode[4][i] for i in self.vars[4]]
+        return names
+
+    @functools.cached_property
+    def pollutant_codes(self):
+        """Concentration units code of each pollutant."""
+        return self._id_section[1]
+
+    @functools.cached_property
+    def propcode(self):
+        """Property codes for subcatchments, nodes, and links."""
+        return self._property_section[0]
+
+    @functools.cached_property
+    def prop(self):
+        """Property tables for subcatchments, nodes, and links."""
+        return self._property_section[1]
+
+    @functools.cached_property
+    def vars(self):
+        """Reporting variable codes for each type."""
+        variables = dict(self._variables_section[1])
+        variables[3] = [0]
+        return variables
+
+    @functools.cached_property
+    def swmm_nsubcatchvars(self):
+        """Number of variables reported for each subcatchment."""
+        return len(self.vars[0])
+
+    @functools.cached_property
+    def nnodevars(self):
+        """Number of variables reported for each node."""
+        return len(self.vars[1])
+
+    @functools.cached_property
+    def nlinkvars(self):
+        """Number of variables reported for each link."""
+        return len(self.vars[2])
+
+    @functools.cached_property
+    def nsystemvars(self):
+        """Number of system variables reported."""
+        return len(self.vars[4])
+
+    @functools.cached_property
+    def startdate(self):
+        """Start date of the simulation."""
+        return self._variables_section[2]
+
+    @functools.cached_property
+    def reportinterval(self):
+        """Time between reported periods."""
+        return self._variables_section[3]
+
+    @functools.cached_property
+    def bytesperperiod(self):
+        """The bytes for each time period of the computed results."""
+        return self.record_size * (
             2
             + self.swmm_nsubcatch * self.swmm_nsubcatchvars
             + self.swmm_nnodes * self.nnodevars
@@ -389,6 +699,127 @@ class SwmmExtract:
             + self.nsystemvars
         )
 
+    @functools.cached_property
+    def _base_varcode(self):
+        """Variable names for the version of SWMM that wrote the file."""
+        return VARCODE_OLD if self.version < 5100 else VARCODE
+
+    @functools.cached_property
+    def varcode(self):
+        """Variable names by type and code, including the pollutants."""
+        # Add pollutant names to subcatchment, nodes, and links.  The names
+        # are only read if there are pollutants.
+        varcode = copy.deepcopy(self._base_varcode)
+        if self.swmm_npolluts:
+            for typenumber in (0, 1, 2):
+                start = len(self._base_varcode[typenumber])
+                end = start + len(self.names[3])
+                nlabels = list(range(start, end))
+                ndict = dict(list(zip(nlabels, self.names[3])))
+                varcode[typenumber].update(ndict)
+        return varcode
+
+    @functools.cached_property
+    def name_index(self):
+        """Position of each name, "name_index[typenumber][name]".
+
+        Built in O(n) for each type on first use.  If names are duplicated
+        the first one wins, matching the previous list search.
+        """
+        return _LazyIndex(self._build_name_index)
+
+    @functools.cached_property
+    def variable_index(self):
+        """Position of each variable, "variable_index[typenumber][varname]".
+
+        The position is within the values of each item of the type.  System
+        variables can be resolved without reading any names.
+        """
+        return _LazyIndex(self._build_variable_index)
+
+    def _build_name_index(self, typenumber):
+        """Build the "name_index" for one type."""
+        index = {}
+        for itemindex, name in enumerate(self.names[typenumber]):
+            index.setdefault(name, itemindex)
+        return index
+
+    def _build_variable_index(self, typenumber):
+        """Build the "variable_index" for one type."""
+        if typenumber not in (0, 1, 2, 4):
+            raise KeyError(typenumber)
+        varcode = self._base_varcode if typenumber == 4 else self.varcode
+        index = {}
+        for variableindex, code in enumerate(self.vars[typenumber]):
+            index.setdefault(varcode[typenumber][code], variableindex)
+        return index
+
+    def _load_cache(self, cachefile, cachekey):
+        """Set the header attributes from the cache file if it is current."""
+        if cachefile is None:
+            return False
+        try:
+            with open(cachefile, encoding="utf-8") as fpc:
+                cached = json.load(fpc)
+        except (OSError, ValueError):
+            return False
+        if cached.get("key") != cachekey:
+            return False
+
+        self._set_header_metadata(cached["meta"])
+        return True
+
+    def _save_cache(self, cachefile, cachekey):
+        """Write the header attributes to the cache file."""
+        if cachefile is None:
+            return
+        # Write to a temporary file and rename so that a concurrent reader
+        # never sees a partial cache file.
+        tmpname = f"{cachefile}.{os.getpid()}.tmp"
+        with suppress(OSError):
+            with open(tmpname, "w", encoding="utf-8") as fpc:
+                json.dump({"key": cachekey, "meta": self.header_metadata()}, fpc)
+            os.replace(tmpname, cachefile)
+
+    def header_metadata(self):
+        """Return the parsed header as a JSON serializable dictionary."""
+        meta = {attr: getattr(self, attr) for attr in _CACHED_COUNTS}
+        meta.update(
+            {
+                "itemlist": self.itemlist,
+                "names": self.names,
+                "varcode": self.varcode,
+                "pollutant_codes": self.pollutant_codes,
+                "propcode": self.propcode,
+                "prop": {k: v.tolist() for k, v in self.prop.items()},
+                "vars": self.vars,
+                "startdate": self.startdate.isoformat(),
+                "reportinterval": self.reportinterval.total_seconds(),
+            }
+        )
+        return meta
+
+    def _set_header_metadata(self, meta):
+        """Set the header attributes from a "header_metadata" dictionary."""
+        for attr in _CACHED_COUNTS:
+            setattr(self, attr, meta[attr])
+        self.itemlist = meta["itemlist"]
+        self.names = {int(k): v for k, v in meta["names"].items()}
+        self.varcode = {
+            int(k): {int(i): j for i, j in v.items()}
+            for k, v in meta["varcode"].items()
+        }
+        self.pollutant_codes = tuple(meta["pollutant_codes"])
+        self.propcode = {int(k): tuple(v) for k, v in meta["propcode"].items()}
+        self.prop = {
+            int(k): np.array(v, dtype="f4").reshape(len(v), len(self.propcode[int(k)]))
+            for k, v in meta["prop"].items()
+        }
+        self.vars = {int(k): tuple(v) for k, v in meta["vars"].items()}
+        self.vars[3] = [0]
+        self.startdate = datetime.datetime.fromisoformat(meta["startdate"])
+        self.reportinterval = datetime.timedelta(seconds=meta["reportinterval"])
+
     def type_check(self, itemtype):
         """Type check the itemtype argument."""
         if itemtype in (0, 1, 2, 3, 4):
@@ -411,8 +842,8 @@ class SwmmExtract:
         """Check that the itemname is in the itemtype list."""
         self.itemtype = self.type_check(itemtype)
         try:
-            itemindex = self.names[self.itemtype].index(str(itemname))
-        except (ValueError, KeyError) as exc:
+            itemindex = self.name_index[self.itemtype][str(itemname)]
+        except KeyError as exc:
             raise ValueError(
                 tsutils.error_wrapper(
                     f"""
@@ -422,305 +853,2248 @@ class SwmmExtract:
             ) from exc
         return (itemname, itemindex)
 
-    def get_swmm_results(self, itemtype, name, variableindex, period):
-        """Get the SWMM results for the given itemtype, name, variableindex, and period."""
-        if itemtype not in (0, 1, 2, 4):
+    def variable_check(self, itemtype, variable):
+        """Return the variable name and index within the values of an item.
+
+        The "variable" can be the name of the variable or the code listed by
+        "listvariables".
+        """
+        typenumber = self.type_check(itemtype)
+        variable = str(variable)
+        if typenumber not in (0, 1, 2, 4):
             raise ValueError(
                 tsutils.error_wrapper(
                     f"""
-                    Type must be one of subcatchment (0), node (1). link (2),
-                    or system (4). You gave "{itemtype}".
+                    There are no variables for "{itemtype}".
+                    """
+                )
+            )
+        found = self._find_variable(typenumber, variable)
+        if found is None:
+            raise ValueError(
+                tsutils.error_wrapper(
+                    f"""
+                    Variable "{variable}" was not found for "{itemtype}".
                     """
                 )
             )
+        return found
+
+    def _find_variable(self, typenumber, variable):
+        """The (name, index) of a variable name or code, or None if missing."""
+        variable = str(variable)
+        index = self.variable_index[typenumber]
+        if variable not in index and variable.lstrip("-").isdigit():
+            variable = self.varcode[typenumber].get(int(variable), variable)
+        if variable not in index:
+            return None
+        return (variable, index[variable])
+
+    def resolve_label(self, itemtype="", name="", variable=""):
+        """Resolve a possibly wild card label to positions in a period record.
+
+        An empty or None part of the label matches everything, as in the
+        "labels" of "extract".  Returns a list of (itemtype, name, variable,
+        value_index) tuples in the same order as "catalog".
+        """
+        if itemtype:
+            itemtypes = [self.itemlist[self.type_check(itemtype)]]
+        else:
+            itemtypes = ["subcatchment", "node", "link", "system"]
 
-        _, itemindex = self.name_check(itemtype, name)
+        collect = []
+        for itype in itemtypes:
+            typenumber = self.type_check(itype)
+            if typenumber == 3:
+                continue
 
-        date_offset = self.startpos + period * self.bytesperperiod
+            if variable:
+                found = self._find_variable(typenumber, variable)
+                if found is None:
+                    continue
+                variables = [found]
+            else:
+                variables = list(self.variable_index[typenumber].items())
+
+            if typenumber == 4:
+                # System variables are listed in the catalog as both the
+                # name and the variable.
+                for vname, variableindex in variables:
+                    if name and str(name) != vname:
+                        continue
+                    collect.append(
+                        (
+                            itype,
+                            vname,
+                            vname,
+                            self.value_index(typenumber, 0, variableindex),
+                        )
+                    )
+                continue
 
-        # Rewind
-        self.fpb.seek(date_offset, 0)
+            if name:
+                itemindex = self.name_index[typenumber].get(str(name))
+                if itemindex is None:
+                    continue
+                items = [(str(name), itemindex)]
+            else:
+                items = [(i, j) for j, i in enumerate(self.names[typenumber])]
 
-        date = struct.unpack("d", self.fpb.read(2 * self.record_size))[0]
+            collect.extend(
+                (
+                    itype,
+                    iname,
+                    vname,
+                    self.value_index(typenumber, itemindex, variableindex),
+                )
+                for iname, itemindex in items
+                for vname, variableindex in variables
+            )
+        return collect
 
-        offset = date_offset + 2 * self.record_size  # skip the date
+    def value_index(self, itemtype, itemindex, variableindex):
+        """Position of a variable within the values of one period record.
 
+        The returned index counts 4 byte values after the 8 byte date at the
+        beginning of each period record.
+        """
         if itemtype == 0:
-            offset = offset + self.record_size * (itemindex * self.swmm_nsubcatchvars)
+            offset = itemindex * self.swmm_nsubcatchvars
         elif itemtype == 1:
-            offset = offset + self.record_size * (
+            offset = (
                 self.swmm_nsubcatch * self.swmm_nsubcatchvars
                 + itemindex * self.nnodevars
             )
         elif itemtype == 2:
-            offset = offset + self.record_size * (
+            offset = (
                 self.swmm_nsubcatch * self.swmm_nsubcatchvars
                 + self.swmm_nnodes * self.nnodevars
                 + itemindex * self.nlinkvars
             )
         elif itemtype == 4:
-            offset = offset + self.record_size * (
+            offset = (
                 self.swmm_nsubcatch * self.swmm_nsubcatchvars
                 + self.swmm_nnodes * self.nnodevars
                 + self.swmm_nlinks * self.nlinkvars
             )
-        offset = offset + self.record_size * variableindex
+        else:
+            raise ValueError(
+                tsutils.error_wrapper(
+                    f"""
+                    Type must be one of subcatchment (0), node (1). link (2),
+                    or system (4). You gave "{itemtype}".
+                    """
+                )
+            )
+        return offset + variableindex
 
-        self.fpb.seek(offset, 0)
-        value = struct.unpack("f", self.fpb.read(self.record_size))[0]
-        return (date, value)
+    @property
+    def results(self):
+        """The results block as a read only structured numpy memmap.
 
+        There is one record for each time period with a "date" field (float64
+        days since 1899-12-30) and a "values" field with all of the float32
+        values written for that period.
+        """
+        if self._results is None:
+            if self._path is not None:
+                self._results = _results_memmap(
+                    self._path, self.startpos, self.swmm_nperiods, self.bytesperperiod
+                )
+            else:
+                self._results = self._results_from_object()
+        return self._results
 
-def about():
-    """Display version number and system information."""
-    return tsutils.about(__name__)
+    def _results_from_object(self):
+        """The results block of an output file given as bytes or file object.
 
+        Uses the buffer of bytes or io.BytesIO without copying, a memory
+        map if the file object has a file descriptor, and reads the results
+        block into memory otherwise.
+        """
+        nvalues = (self.bytesperperiod - 2 * self.record_size) // self.record_size
+        dtype = np.dtype([("date", "f8"), ("values", "f4", (nvalues,))])
+        if self._buffer is not None:
+            return np.frombuffer(
+                self._buffer,
+                dtype=dtype,
+                count=self.swmm_nperiods,
+                offset=self.startpos,
+            )
+        with suppress(AttributeError, OSError, ValueError):
+            return np.memmap(
+                self.fpb,
+                dtype=dtype,
+                mode="r",
+                offset=self.startpos,
+                shape=(self.swmm_nperiods,),
+            )
+        block = self._read_block(
+            self.startpos, self.startpos + self.swmm_nperiods * self.bytesperperiod
+        )
+        return np.frombuffer(block, dtype=dtype, count=self.swmm_nperiods)
 
-@tsutils.doc(_LOCAL_DOCSTRINGS)
-def catalog(filename, itemtype=""):
-    """List the catalog of objects in output file.
+    def _raw_dates(self):
+        """The float64 dates of all periods."""
+        return self.results["date"]
 
-    This catalog list is all of the labels that can be used in the extract
-    routine.
+    @property
+    def dates(self):
+        """The dates of all time periods as a pandas DatetimeIndex.
 
-    Parameters
-    ----------
-    ${filename}
-    ${itemtype}
-    ${tablefmt}
-    ${header}
-    """
-    obj = SwmmExtract(filename)
-    if itemtype:
-        typenumber = obj.type_check(itemtype)
-        plist = [typenumber]
-    else:
-        plist = list(range(len(obj.itemlist)))
-    collect = []
-    for i in plist:
-        typenumber = obj.type_check(obj.itemlist[i])
-        for oname in obj.names[i]:
-            if obj.itemlist[i] == "pollutant":
-                continue
-            if obj.itemlist[i] == "system":
-                collect.append(["system", oname, oname])
-                continue
-            collect.extend(
-                [obj.itemlist[i], oname, obj.varcode[typenumber][j]]
-                for j in obj.vars[typenumber]
-            )
-    return collect
+        The date column is read once and cached on the instance.
+        """
+        if self._dates is None:
+            self._dates = _decode_dates(self._raw_dates())
+        return self._dates
 
+    def get_dates(self, start=0, stop=None, step=1):
+        """The dates of the time periods selected by "start", "stop", "step".
 
-@tsutils.doc(_LOCAL_DOCSTRINGS)
-def listdetail(filename, itemtype, name="", header="default"):
-    """List nodes and metadata in output file.
+        A range that starts at the first period and runs to the end of the
+        file reads and caches "dates" so that later calls reuse it.  Any
+        other range uses the cached "dates" if already read, otherwise only
+        decodes the date of the selected period records.
+        """
+        if not start and (stop is None or stop >= self.swmm_nperiods):
+            return self.dates[start:stop:step]
+        if self._dates is not None:
+            return self._dates[start:stop:step]
+        return _decode_dates(self._raw_dates()[start:stop:step])
 
-    Parameters
-    ----------
-    ${filename}
+    def dates_at(self, periods):
+        """The dates of the time periods with the indices "periods".
 
-    ${itemtype}
+        Uses the cached "dates" if already read, otherwise only decodes the
+        date of the given period records.
+        """
+        if self._dates is not None:
+            return self._dates[periods]
+        return _decode_dates(self._raw_dates()[periods])
 
-    name : str
-        [optional, default is '']
+    def period_range(self, start_date=None, end_date=None):
+        """Convert a date range to a (start, stop) range of period indices.
 
-        Specific name to print only that entry.  This can be
-        looked up using 'listvariables'.
+        The period indices are computed from "startdate" and
+        "reportinterval" without reading the results block.  The first
+        reported period is one "reportinterval" after "startdate".
+        """
+        interval = self.reportinterval.total_seconds()
+        start = 0
+        stop = self.swmm_nperiods
+        if start_date is not None:
+            start_date = pd.Timestamp(tsutils.parsedate(start_date))
+            elapsed = (start_date - pd.Timestamp(self.startdate)).total_seconds()
+            start = max(start, math.ceil(elapsed / interval) - 1)
+        if end_date is not None:
+            end_date = pd.Timestamp(tsutils.parsedate(end_date))
+            elapsed = (end_date - pd.Timestamp(self.startdate)).total_seconds()
+            stop = min(stop, math.floor(elapsed / interval))
+        return (start, max(start, stop))
 
-    ${tablefmt}
+    def get_swmm_results(self, itemtype, name, variableindex, period):
+        """Get the SWMM results for the given itemtype, name, variableindex, and period."""
+        if itemtype not in (0, 1, 2, 4):
+            raise ValueError(
+                tsutils.error_wrapper(
+                    f"""
+                    Type must be one of subcatchment (0), node (1). link (2),
+                    or system (4). You gave "{itemtype}".
+                    """
+                )
+            )
 
-    ${header}
-    """
-    obj = SwmmExtract(filename)
-    typenumber = obj.type_check(itemtype)
-    if name:
-        objectlist = [obj.name_check(itemtype, name)[0]]
-    else:
-        objectlist = obj.names[typenumber]
+        _, itemindex = self.name_check(itemtype, name)
 
-    propnumbers = obj.propcode[typenumber]
-    if header == "default":
-        header = ["#Name"] + [PROPCODE[typenumber][i] for i in propnumbers]
+        date_offset = self.startpos + period * self.bytesperperiod
 
-    collect = []
-    for i, oname in enumerate(objectlist):
-        printvar = [oname]
-        for j in obj.prop[typenumber][i]:
-            if j[0] == 0:
-                try:
-                    printvar.append(TYPECODE[typenumber][j[1]])
-                except KeyError:
-                    printvar.append(TYPECODE[typenumber][0])
-            else:
-                printvar.append(j[1])
-        collect.append(printvar)
-    dfc = pd.DataFrame(collect)
-    cheader = []
-    for head in header:
-        if head not in cheader:
-            cheader.append(head)
-        else:
-            cnt = cheader.count(head)
-            cheader.append(f"{head}.{cnt}")
-    dfc.columns = cheader
-    return dfc
+        (date,) = struct.unpack(
+            "d", self._read_block(date_offset, date_offset + 2 * self.record_size)
+        )
 
+        offset = (
+            date_offset
+            + 2 * self.record_size
+            + self.record_size * self.value_index(itemtype, itemindex, variableindex)
+        )
 
-@tsutils.doc(_LOCAL_DOCSTRINGS)
-def listvariables(filename, header="default"):
-    """List variables available for each type.
+        (value,) = struct.unpack(
+            "f", self._read_block(offset, offset + self.record_size)
+        )
+        return (date, value)
 
-    The type are "subcatchment", "node", "link", "pollutant", "system".
+    def get_swmm_series(self, itemtype, name, variableindex):
+        """Get the dates and values of one variable for all time periods.
 
-    Parameters
-    ----------
-    ${filename}
-    ${tablefmt}
-    ${header}
-    """
-    obj = SwmmExtract(filename)
-    if header == "default":
-        header = ["TYPE", "DESCRIPTION", "VARINDEX"]
-    # 'pollutant' really isn't it's own itemtype
-    # but part of subcatchment, node, and link...
-    collect = []
-    for itemtype in ("subcatchment", "node", "link", "system"):
-        typenumber = obj.type_check(itemtype)
+        The values are taken as a single strided slice of the memory mapped
+        results block rather than one read per time period.
+        """
+        itemtype = self.type_check(itemtype)
+        _, itemindex = self.name_check(itemtype, name)
+        column = self.value_index(itemtype, itemindex, variableindex)
+        return (
+            np.array(self.results["date"]),
+            np.array(self.results["values"][:, column]),
+        )
 
-        for i in obj.vars[typenumber]:
-            try:
-                collect.append([itemtype, obj.varcode[typenumber][i].decode(), i])
-            except (TypeError, AttributeError):
-                collect.append([itemtype, str(obj.varcode[typenumber][i]), str(i)])
-    return collect
+    def get_swmm_values(self, columns, start=0, stop=None, step=1):
+        """Get the values of many variables for a range of time periods.
 
+        The "columns" argument is a list of positions within the period
+        record, as returned by "value_index".  Only the period records
+        selected by "start", "stop", and "step" are read, and they are swept
+        once, a block of periods at a time, filling a preallocated
+        (nperiods, len(columns)) float32 array.
+        """
+        periods = range(self.swmm_nperiods)[start:stop:step]
+        columns = np.asarray(columns, dtype="int64")
+        values = np.empty((len(periods), len(columns)), dtype="f4")
+        results = self.results["values"]
+        row = 0
+        for block in self.period_blocks(start=start, stop=stop, step=step):
+            values[row : row + len(block)] = results[
+                block.start : block.stop : block.step
+            ][:, columns]
+            row += len(block)
+        return values
+
+    def get_swmm_period(self, period, out=None):
+        """Get all of the values of one time period.
+
+        Only the one period record is read.  The values are in the order of
+        "value_index" and are copied into the float32 array "out" if given,
+        so that many periods can be read without allocating.
+        """
+        values = self.results["values"][period]
+        if out is None:
+            return np.array(values)
+        np.copyto(out, values)
+        return out
+
+    def period_at(self, time):
+        """The index of the last reported period on or before "time"."""
+        time = pd.Timestamp(tsutils.parsedate(time))
+        elapsed = (time - pd.Timestamp(self.startdate)).total_seconds()
+        period = math.floor(elapsed / self.reportinterval.total_seconds()) - 1
+        if not 0 <= period < self.swmm_nperiods:
+            raise ValueError(
+                tsutils.error_wrapper(
+                    f"""
+                    The time "{time}" is outside of the reported periods
+                    from "{self.get_dates(stop=1)[0]}" to
+                    "{self.get_dates(start=-1)[0]}".
+                    """
+                )
+            )
+        return period
+
+    def get_swmm_values_parallel(
+        self,
+        columns,
+        start=0,
+        stop=None,
+        step=1,
+        workers=2,
+        executor="thread",
+        partition="periods",
+    ):
+        """Get the same array as "get_swmm_values" using a pool of workers.
 
-@tsutils.doc(_LOCAL_DOCSTRINGS)
-def stdtoswmm5(start_date=None, end_date=None, input_ts="-"):
-    """Take the toolbox standard format and return SWMM5 format.
+        With "partition" set to "periods" each worker reads a contiguous range
+        of period records for all columns, and with "labels" each worker reads
+        all selected periods for a subset of the columns.  Every worker maps
+        the file on its own.  The "executor" is either "thread" or "process".
 
-    Toolbox standard::
+        An output file given as bytes or a file object cannot be mapped again
+        by a worker, so it is always read by threads that share "results".
+        """
+        pools = {"thread": ThreadPoolExecutor, "process": ProcessPoolExecutor}
+        if executor not in pools:
+            raise ValueError(
+                tsutils.error_wrapper(
+                    f"""
+                    The "executor" argument must be "thread" or "process".  You
+                    gave "{executor}".
+                    """
+                )
+            )
+        if partition not in ("periods", "labels"):
+            raise ValueError(
+                tsutils.error_wrapper(
+                    f"""
+                    The "partition" argument must be "periods" or "labels".
+                    You gave "{partition}".
+                    """
+                )
+            )
+
+        if self._path is not None:
+            read = functools.partial(
+                _read_values_block,
+                (self._path, self.startpos, self.swmm_nperiods, self.bytesperperiod),
+            )
+        else:
+            read = functools.partial(_take_values_block, self.results["values"])
+            executor = "thread"
+        periods = range(self.swmm_nperiods)[start:stop:step]
+        columns = np.asarray(columns, dtype="int64")
+        workers = int(workers)
+        if partition == "periods":
+            edges = np.linspace(0, len(periods), workers + 1).astype("int64")
+            tasks = [
+                (columns, periods[i:j]) for i, j in itertools.pairwise(edges) if j > i
+            ]
+            axis = 0
+        else:
+            tasks = [
+                (i, periods)
+                for i in np.array_split(columns, min(workers, len(columns)))
+                if len(i)
+            ]
+            axis = 1
+
+        if not tasks:
+            return np.empty((len(periods), len(columns)), dtype="f4")
+        with pools[executor](max_workers=workers) as pool:
+            blocks = list(pool.map(read, [i[0] for i in tasks], [i[1] for i in tasks]))
+        return np.concatenate(blocks, axis=axis)
+
+    def iter_swmm_values(self, columns, start=0, stop=None, step=1, chunksize=None):
+        """Yield (block, values) for successive blocks of time periods.
+
+        Like "get_swmm_values", but the period records are read sequentially
+        and only "chunksize" periods are in memory at a time.  The "block" is
+        the range of period indices of the (len(block), len(columns)) float32
+        "values" array.
+        """
+        columns = np.asarray(columns, dtype="int64")
+        results = self.results["values"]
+        for block in self.period_blocks(
+            start=start, stop=stop, step=step, chunksize=chunksize
+        ):
+            yield (
+                block,
+                np.array(results[block.start : block.stop : block.step][:, columns]),
+            )
+
+    def period_blocks(self, start=0, stop=None, step=1, chunksize=None):
+        """Split the selected period indices into ranges of "chunksize"."""
+        if chunksize is None:
+            chunksize = self.chunk_periods()
+        periods = range(self.swmm_nperiods)[start:stop:step]
+        for row in range(0, len(periods), int(chunksize)):
+            yield periods[row : row + int(chunksize)]
+
+    def chunk_periods(self, chunk_bytes=64 * 1024**2):
+        """Number of period records that fit in about "chunk_bytes" bytes."""
+        return max(1, chunk_bytes // self.bytesperperiod)
+
+
+# Files of a column store written by "convert".
+_STORE_FORMAT = 3
+_STORE_METADATA = "swmmtoolbox.json"
+
+
+class SwmmColumnStore(SwmmExtract):
+    """Read a SWMM output file that was converted to a column store.
+
+    The store is a directory written by "convert" with the header metadata
+    in "swmmtoolbox.json", the period dates in "dates.npy", and the values in
+    "values_NNNNN.npy" files.  Each values file is a block of consecutive
+    periods transposed to (values per period, periods) so that the series of
+    one variable is contiguous.
+    """
+
+    def __init__(self, dirname):
+        """Read the metadata of the column store in "dirname"."""
+        self.record_size = 4
+        self.filename = dirname
+        self._path = dirname
+        self._buffer = None
+        self._owns_file = False
+        self.fpb = None
+        self._results = None
+        self._dates = None
+        try:
+            with open(os.path.join(dirname, _STORE_METADATA), encoding="utf-8") as fpm:
+                store = json.load(fpm)
+        except (OSError, ValueError) as exc:
+            raise ValueError(
+                tsutils.error_wrapper(
+                    f"""
+                    The directory "{dirname}" is not a swmmtoolbox column
+                    store written by "swmmtoolbox convert".
+                    """
+                )
+            ) from exc
+        if store.get("format") != _STORE_FORMAT:
+            raise ValueError(
+                tsutils.error_wrapper(
+                    f"""
+                    Column store format "{store.get("format")}" is not
+                    supported, must be "{_STORE_FORMAT}".
+                    """
+                )
+            )
+        self.swmm_nperiods = store["nperiods"]
+        self.chunks = store["chunks"]
+        self._set_header_metadata(store["meta"])
+
+    @property
+    def results(self):
+        """Not available, the results block is not kept in a column store."""
+        raise AttributeError("A column store has no row oriented results block.")
+
+    def _raw_dates(self):
+        """The float64 dates of all periods."""
+        return np.load(os.path.join(self.filename, "dates.npy"), mmap_mode="r")
+
+    def get_swmm_results(self, itemtype, name, variableindex, period):
+        """Get the SWMM results for the given itemtype, name, variableindex, and period."""
+        itemtype = self.type_check(itemtype)
+        _, itemindex = self.name_check(itemtype, name)
+        column = self.value_index(itemtype, itemindex, variableindex)
+        value = self.get_swmm_values([column], start=period, stop=period + 1)
+        return (float(self._raw_dates()[period]), float(value[0, 0]))
+
+    def get_swmm_series(self, itemtype, name, variableindex):
+        """Get the dates and values of one variable for all time periods."""
+        itemtype = self.type_check(itemtype)
+        _, itemindex = self.name_check(itemtype, name)
+        column = self.value_index(itemtype, itemindex, variableindex)
+        return (np.array(self._raw_dates()), self.get_swmm_values([column])[:, 0])
+
+    def get_swmm_values(self, columns, start=0, stop=None, step=1):
+        """Get the values of many variables for a range of time periods.
+
+        Only the rows of "columns" are read from each values file that
+        overlaps the selected periods.
+        """
+        periods = np.arange(self.swmm_nperiods)[start:stop:step]
+        columns = np.asarray(columns, dtype="int64")
+        values = np.empty((len(periods), len(columns)), dtype="f4")
+        for first, count, name in self.chunks:
+            mask = (periods >= first) & (periods < first + count)
+            if not mask.any():
+                continue
+            block = np.load(os.path.join(self.filename, name), mmap_mode="r")
+            values[mask] = block[np.ix_(columns, periods[mask] - first)].T
+        return values
+
+    def get_swmm_period(self, period, out=None):
+        """Get all of the values of one time period."""
+        period = range(self.swmm_nperiods)[period]
+        for first, count, name in self.chunks:
+            if first <= period < first + count:
+                block = np.load(os.path.join(self.filename, name), mmap_mode="r")
+                if out is None:
+                    return np.array(block[:, period - first])
+                np.copyto(out, block[:, period - first])
+                return out
+        raise IndexError(f"Period {period} is not in the column store.")
+
+    def get_swmm_values_parallel(self, columns, start=0, stop=None, step=1, **kwds):
+        """Read serially, the values of a column store are already contiguous."""
+        return self.get_swmm_values(columns, start=start, stop=stop, step=step)
+
+    def iter_swmm_values(self, columns, start=0, stop=None, step=1, chunksize=None):
+        """Yield (block, values) for successive blocks of time periods."""
+        for block in self.period_blocks(
+            start=start, stop=stop, step=step, chunksize=chunksize
+        ):
+            yield (
+                block,
+                self.get_swmm_values(
+                    columns, start=block.start, stop=block.stop, step=block.step
+                ),
+            )
+
+
+class SwmmLiveExtract(SwmmExtract):
+    """Read a SWMM output file while SWMM is still writing it.
+
+    The footer with "names_start_pos", "offset0", "startpos", and
+    "swmm_nperiods" is only written at the end of a run, so the header is
+    parsed sequentially from the beginning of the file instead and the
+    number of complete time periods is inferred from the size of the file.
+    Call "refresh" to pick up periods appended since the last call.
+
+    Raises EOFError if the header has not been completely written yet.
+    """
+
+    def _read_prologue(self, cache):
+        """Walk the header from the start of the file to find "startpos".
+
+        There is no footer to key a metadata cache, so "cache" is ignored.
+        """
+        self.fpb.seek(0, 0)
+        (
+            magic1,
+            self.version,
+            self.swmm_flowunits,
+            self.swmm_nsubcatch,
+            self.swmm_nnodes,
+            self.swmm_nlinks,
+            self.swmm_npolluts,
+        ) = struct.unpack("7i", self._read_exactly(7 * self.record_size))
+        if magic1 != 516114522:
+            raise ValueError(
+                tsutils.error_wrapper(
+                    """
+                    Not a SWMM output file, bad magic number at beginning
+                    """
+                )
+            )
+        self.itemlist = ["subcatchment", "node", "link", "pollutant", "system"]
+
+        self.names_start_pos = 7 * self.record_size
+        for _ in range(
+            self.swmm_nsubcatch
+            + self.swmm_nnodes
+            + self.swmm_nlinks
+            + self.swmm_npolluts
+        ):
+            self.fpb.seek(self._read_int(), 1)
+        self.fpb.seek(self.swmm_npolluts * self.record_size, 1)
+        self.offset0 = self.fpb.tell()
+
+        for count in (self.swmm_nsubcatch, self.swmm_nnodes, self.swmm_nlinks):
+            nprop = self._read_int()
+            self.fpb.seek((nprop + count * nprop) * self.record_size, 1)
+        for _ in range(4):
+            self.fpb.seek(self._read_int() * self.record_size, 1)
+        # The start date is a double followed by the report interval.
+        self.startpos = self.fpb.tell() + 3 * self.record_size
+
+        self.swmm_nperiods = 0
+        self.finished = False
+        self.errcode = 0
+        self.refresh()
+
+    def _read_exactly(self, size):
+        """Read "size" bytes, raise EOFError if not written yet."""
+        data = self.fpb.read(size)
+        if len(data) < size:
+            raise EOFError(
+                f"The header of the SWMM output file {self.filename} is "
+                "not completely written yet."
+            )
+        return data
+
+    def _read_int(self):
+        """Read the next 4 byte integer of the header."""
+        return struct.unpack("i", self._read_exactly(self.record_size))[0]
+
+    def refresh(self):
+        """Update "swmm_nperiods" from the current size of the file.
+
+        Once SWMM writes the footer "finished" is True, and "errcode" is the
+        error code of the run.  Returns the number of new periods.
+        """
+        with self._lock:
+            if self.finished:
+                return 0
+            self.fpb.seek(0, 2)
+            size = self.fpb.tell()
+            if size < self.startpos:
+                raise EOFError(
+                    f"The header of the SWMM output file {self.filename} is "
+                    "not completely written yet."
+                )
+            nperiods = (size - self.startpos) // self.bytesperperiod
+            footer_size = 6 * self.record_size
+            if (size - self.startpos) % self.bytesperperiod == footer_size:
+                self.fpb.seek(-footer_size, 2)
+                footer = struct.unpack("6i", self.fpb.read(footer_size))
+                if (
+                    footer[0] == self.names_start_pos
+                    and footer[2] == self.startpos
+                    and footer[5] == 516114522
+                ):
+                    self.finished = True
+                    nperiods = footer[3]
+                    self.errcode = footer[4]
+            new = nperiods - self.swmm_nperiods
+            if new > 0:
+                self.swmm_nperiods = nperiods
+                self._results = None
+                self._dates = None
+            return max(0, new)
+
+
+class SwmmWriter:
+    """Write a SWMM 5 binary output file.
+
+    The header is written when the writer is created, the period records
+    are appended by each call to "write", and "close" writes the footer, so
+    only one block of periods has to be in memory at a time.  The arguments
+    have the same structure as the attributes of "SwmmExtract"::
+
+        with SwmmWriter("new.out", names, variables, startdate, 300) as out:
+            for block in blocks:
+                out.write(block)
+    """
+
+    def __init__(
+        self,
+        filename,
+        names,
+        variables,
+        startdate,
+        reportinterval,
+        propcode=None,
+        prop=None,
+        pollutant_codes=None,
+        version=51015,
+        flowunits=0,
+    ):
+        """Create the output file and write the header.
+
+        Parameters
+        ----------
+        filename : str
+            Filename of the SWMM output file to write.
+        names : dict
+            Lists of the names of the subcatchments (0), nodes (1), links
+            (2), and pollutants (3), like "SwmmExtract.names".
+        variables : dict
+            Lists of the variable codes reported for subcatchments (0),
+            nodes (1), links (2), and the system (4), like
+            "SwmmExtract.vars".
+        startdate : datetime
+            Start of the simulation, the first period is one
+            "reportinterval" later.
+        reportinterval : int or timedelta
+            Time between reported periods, in seconds if an int.
+        propcode : dict
+            [optional, default is None]
+
+            Lists of the property codes of subcatchments (0), nodes (1), and
+            links (2), like "SwmmExtract.propcode".  The default of None
+            writes no properties.
+        prop : dict
+            [optional, default is None]
+
+            The (count, len(propcode[type])) property values of each type,
+            like "SwmmExtract.prop".
+        pollutant_codes : list
+            [optional, default is None]
+
+            The concentration unit code of each pollutant, the default of
+            None uses 0 for all.
+        version : int
+            [optional, default is 51015]
+
+            The SWMM version number written to the file.  Versions before
+            5100 use the older list of subcatchment variables.
+        flowunits : int
+            [optional, default is 0]
+
+            The flow units code, 0 is CFS.
+        """
+        self.record_size = 4
+        self.filename = filename
+        self.names = {i: [str(j) for j in names.get(i, [])] for i in (0, 1, 2, 3)}
+        self.vars = {i: list(variables.get(i, [])) for i in (0, 1, 2, 4)}
+        self.counts = [len(self.names[i]) for i in (0, 1, 2, 3)]
+        self.nvalues = (
+            self.counts[0] * len(self.vars[0])
+            + self.counts[1] * len(self.vars[1])
+            + self.counts[2] * len(self.vars[2])
+            + len(self.vars[4])
+        )
+        if isinstance(startdate, (int, float)):
+            self.startdate = float(startdate)
+        else:
+            self.startdate = (
+                pd.Timestamp(startdate) - pd.Timestamp(1899, 12, 30)
+            ).total_seconds() / 86400
+        if isinstance(reportinterval, datetime.timedelta):
+            reportinterval = reportinterval.total_seconds()
+        self.reportinterval = int(reportinterval)
+        self.swmm_nperiods = 0
+
+        if pollutant_codes is None:
+            pollutant_codes = [0] * self.counts[3]
+        propcode = propcode or {}
+        prop = prop or {}
+
+        self.fpo = open(filename, "wb")  # noqa: SIM115
+        try:
+            self._write_header(version, flowunits, pollutant_codes, propcode, prop)
+        except BaseException:
+            self.fpo.close()
+            raise
+
+    def _ints(self, *values):
+        """Write 4 byte integers."""
+        self.fpo.write(struct.pack(f"{len(values)}i", *values))
+
+    def _write_header(self, version, flowunits, pollutant_codes, propcode, prop):
+        """Write everything before the first period record."""
+        self._ints(516114522, version, flowunits, *self.counts)
+
+        self.names_start_pos = self.fpo.tell()
+        for typenumber in (0, 1, 2, 3):
+            for name in self.names[typenumber]:
+                name = name.encode("ascii")
+                self._ints(len(name))
+                self.fpo.write(name)
+        self._ints(*pollutant_codes)
+
+        self.offset0 = self.fpo.tell()
+        for typenumber in (0, 1, 2):
+            codes = list(propcode.get(typenumber, []))
+            values = np.asarray(prop.get(typenumber, []), dtype="f4").reshape(
+                self.counts[typenumber], len(codes)
+            )
+            self._ints(len(codes), *codes)
+            self.fpo.write(values.tobytes())
+
+        for typenumber in (0, 1, 2, 4):
+            self._ints(len(self.vars[typenumber]), *self.vars[typenumber])
+        self.fpo.write(struct.pack("d", self.startdate))
+        self._ints(self.reportinterval)
+        self.startpos = self.fpo.tell()
+
+    def write(self, values, dates=None):
+        """Append period records.
+
+        Parameters
+        ----------
+        values : array or DataFrame
+            The (periods, values per period) values, in the order of
+            "SwmmExtract.value_index".
+        dates : DatetimeIndex or array
+            [optional, default is None]
+
+            The dates of the periods.  The default of None uses the index
+            of a DataFrame, or continues at one "reportinterval" after the
+            last period written.
+        """
+        if dates is None and isinstance(values, pd.DataFrame):
+            dates = values.index
+        values = np.asarray(values, dtype="f4")
+        if values.ndim == 1:
+            values = values.reshape(1, -1)
+        if values.shape[1] != self.nvalues:
+            raise ValueError(
+                tsutils.error_wrapper(
+                    f"""
+                    Each period must have {self.nvalues} values, but
+                    {values.shape[1]} were given.
+                    """
+                )
+            )
+        block = np.empty(
+            len(values),
+            dtype=np.dtype([("date", "f8"), ("values", "f4", (self.nvalues,))]),
+        )
+        if dates is None:
+            block["date"] = self.startdate + (
+                np.arange(self.swmm_nperiods + 1, self.swmm_nperiods + len(values) + 1)
+                * self.reportinterval
+                / 86400
+            )
+        elif isinstance(dates, (pd.DatetimeIndex, pd.Series)) or np.issubdtype(
+            np.asarray(dates).dtype, np.datetime64
+        ):
+            block["date"] = (
+                pd.DatetimeIndex(dates) - pd.Timestamp(1899, 12, 30)
+            ).total_seconds() / 86400
+        else:
+            block["date"] = np.asarray(dates, dtype="f8")
+        block["values"] = values
+        block.tofile(self.fpo)
+        self.swmm_nperiods += len(values)
+
+    def close(self, errcode=0):
+        """Write the footer and close the file."""
+        if self.fpo.closed:
+            return
+        self._ints(
+            self.names_start_pos,
+            self.offset0,
+            self.startpos,
+            self.swmm_nperiods,
+            errcode,
+            516114522,
+        )
+        self.fpo.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        # A nonzero error code keeps a partly written file from reading as
+        # a successful run.
+        self.close(errcode=0 if exc_type is None else 1)
+
+
+def _open_reader(filename):
+    """Open a new reader for a SWMM output file or column store."""
+    if isinstance(filename, (str, os.PathLike)) and os.path.isdir(filename):
+        return SwmmColumnStore(filename)
+    return SwmmExtract(filename)
+
+
+# Open readers shared by the module level functions, see "_open".
+_POOL = collections.OrderedDict()
+_POOL_LOCK = threading.Lock()
+# One lock for each path that is being opened, so that a path is only
+# opened by one thread at a time.
+_POOL_OPENING = {}
+
+
+def _pool_size():
+    """Maximum number of open readers kept in the pool."""
+    return int(os.environ.get("SWMMTOOLBOX_POOL_SIZE", "8"))
+
+
+def _pooled(abspath, stamp):
+    """The pooled reader of "abspath" if it is current, else None.
+
+    Must be called with "_POOL_LOCK" held.
+    """
+    entry = _POOL.get(abspath)
+    if entry is not None and entry[0] == stamp and not entry[1].closed:
+        _POOL.move_to_end(abspath)
+        return entry[1]
+    return None
+
+
+def _open(filename):
+    """Open a SWMM output file or a column store written by "convert".
+
+    Readers are kept in a least recently used pool keyed by the absolute
+    path, so repeated calls on the same file share one parsed header and
+    file handle.  A reader is reopened if the file was rewritten (different
+    mtime or size), and the least recently used reader is dropped from the
+    pool when there are more than "SWMMTOOLBOX_POOL_SIZE" (default 8).
+
+    Readers dropped from the pool are not closed, since other threads may
+    still be using them.  The file is closed when the last user releases
+    the reader and it is garbage collected.
+
+    An open "SwmmExtract" is returned as is, and bytes or file objects are
+    opened without the pool.
+    """
+    if isinstance(filename, SwmmExtract):
+        return filename
+    if not isinstance(filename, (str, os.PathLike)):
+        return _open_reader(filename)
+
+    abspath = os.path.abspath(filename)
+    if os.path.isdir(filename):
+        stat = os.stat(os.path.join(filename, _STORE_METADATA))
+    else:
+        stat = os.stat(filename)
+    stamp = (stat.st_mtime_ns, stat.st_size)
+
+    with _POOL_LOCK:
+        obj = _pooled(abspath, stamp)
+        if obj is not None:
+            return obj
+        opening = _POOL_OPENING.setdefault(abspath, threading.Lock())
+
+    try:
+        with opening:
+            # Another thread may have opened the file while waiting.
+            with _POOL_LOCK:
+                obj = _pooled(abspath, stamp)
+                if obj is not None:
+                    return obj
+
+            obj = _open_reader(filename)
+
+            with _POOL_LOCK:
+                _POOL.pop(abspath, None)
+                _POOL[abspath] = (stamp, obj)
+                while len(_POOL) > max(_pool_size(), 1):
+                    _POOL.popitem(last=False)
+    finally:
+        # Threads still waiting on "opening" find the reader in the pool.
+        with _POOL_LOCK:
+            if _POOL_OPENING.get(abspath) is opening:
+                del _POOL_OPENING[abspath]
+    return obj
+
+
+def clear_pool():
+    """Drop all of the readers held by the reader pool.
+
+    Each file is closed once no caller is still using its reader.
+    """
+    with _POOL_LOCK:
+        _POOL.clear()
+
+
+def about():
+    """Display version number and system information."""
+    return tsutils.about(__name__)
+
+
+@tsutils.doc(_LOCAL_DOCSTRINGS)
+def catalog(filename, itemtype=""):
+    """List the catalog of objects in output file.
+
+    This catalog list is all of the labels that can be used in the extract
+    routine.
+
+    Parameters
+    ----------
+    ${filename}
+    ${itemtype}
+    ${tablefmt}
+    ${header}
+    """
+    obj = _open(filename)
+    if itemtype:
+        typenumber = obj.type_check(itemtype)
+        plist = [typenumber]
+    else:
+        plist = list(range(len(obj.itemlist)))
+    collect = []
+    for i in plist:
+        typenumber = obj.type_check(obj.itemlist[i])
+        for oname in obj.names[i]:
+            if obj.itemlist[i] == "pollutant":
+                continue
+            if obj.itemlist[i] == "system":
+                collect.append(["system", oname, oname])
+                continue
+            collect.extend(
+                [obj.itemlist[i], oname, obj.varcode[typenumber][j]]
+                for j in obj.vars[typenumber]
+            )
+    return collect
+
+
+@tsutils.doc(_LOCAL_DOCSTRINGS)
+def listdetail(filename, itemtype, name="", header="default"):
+    """List nodes and metadata in output file.
+
+    Parameters
+    ----------
+    ${filename}
+
+    ${itemtype}
+
+    name : str
+        [optional, default is '']
+
+        Specific name to print only that entry.  This can be
+        looked up using 'listvariables'.
+
+    ${tablefmt}
+
+    ${header}
+    """
+    obj = _open(filename)
+    typenumber = obj.type_check(itemtype)
+    if name:
+        objectlist = [obj.name_check(itemtype, name)]
+    else:
+        objectlist = [(i, j) for j, i in enumerate(obj.names[typenumber])]
+
+    propnumbers = obj.propcode[typenumber]
+    if header == "default":
+        header = ["#Name"] + [PROPCODE[typenumber][i] for i in propnumbers]
+
+    collect = []
+    for oname, itemindex in objectlist:
+        printvar = [oname]
+        for code, value in zip(propnumbers, obj.prop[typenumber][itemindex].tolist()):
+            if code == 0:
+                try:
+                    printvar.append(TYPECODE[typenumber][int(value)])
+                except KeyError:
+                    printvar.append(TYPECODE[typenumber][0])
+            else:
+                printvar.append(value)
+        collect.append(printvar)
+    dfc = pd.DataFrame(collect)
+    cheader = []
+    for head in header:
+        if head not in cheader:
+            cheader.append(head)
+        else:
+            cnt = cheader.count(head)
+            cheader.append(f"{head}.{cnt}")
+    dfc.columns = cheader
+    return dfc
+
+
+@tsutils.doc(_LOCAL_DOCSTRINGS)
+def listvariables(filename, header="default"):
+    """List variables available for each type.
+
+    The type are "subcatchment", "node", "link", "pollutant", "system".
+
+    Parameters
+    ----------
+    ${filename}
+    ${tablefmt}
+    ${header}
+    """
+    obj = _open(filename)
+    if header == "default":
+        header = ["TYPE", "DESCRIPTION", "VARINDEX"]
+    # 'pollutant' really isn't it's own itemtype
+    # but part of subcatchment, node, and link...
+    collect = []
+    for itemtype in ("subcatchment", "node", "link", "system"):
+        typenumber = obj.type_check(itemtype)
+
+        for i in obj.vars[typenumber]:
+            try:
+                collect.append([itemtype, obj.varcode[typenumber][i].decode(), i])
+            except (TypeError, AttributeError):
+                collect.append([itemtype, str(obj.varcode[typenumber][i]), str(i)])
+    return collect
+
+
+def _swmm5_dates(index):
+    """Format a DatetimeIndex as the SWMM5 date and time columns.
+
+    The ISO strings from numpy are rearranged as arrays of characters, so
+    no Python code runs for each date.
+    """
+    if index.tz is not None:
+        index = index.tz_localize(None)
+    text = np.datetime_as_string(index.to_numpy().astype("datetime64[s]"), unit="s")
+    chars = text.astype("U19").view("U1").reshape(-1, 19)
+    # YYYY-MM-DDTHH:MM:SS to MM/DD/YYYY and HH:MM:SS
+    dates = np.ascontiguousarray(chars[:, [5, 6, 4, 8, 9, 4, 0, 1, 2, 3]])
+    dates[:, [2, 5]] = "/"
+    times = np.ascontiguousarray(chars[:, 11:])
+    return (dates.view("U10").ravel(), times.view("U8").ravel())
+
+
+def _write_swmm5(chunks, outdir=None):
+    """Write DataFrame "chunks" as SWMM5 time series.
+
+    All columns are written to stdout, or with "outdir" each column is
+    written to its own "<column>.dat" file in one pass over the chunks.
+    The rows where a column has no value are left out of its file, since
+    gauges in separate files usually have different time stamps.
+    """
+    targets = None
+    try:
+        for tsd in chunks:
+            if targets is None:
+                if outdir is None:
+                    print(";Datetime,", ", ".join(str(i) for i in tsd.columns))
+                    targets = [(sys.stdout, list(range(len(tsd.columns))))]
+                else:
+                    os.makedirs(outdir, exist_ok=True)
+                    targets = []
+                    for number, column in enumerate(tsd.columns):
+                        fpo = open(  # noqa: SIM115
+                            os.path.join(outdir, f"{column}.dat"),
+                            "w",
+                            encoding="ascii",
+                            newline="",
+                        )
+                        targets.append((fpo, [number]))
+                        fpo.write(f";Datetime, {column}\n")
+            if tsd.empty:
+                continue
+            dates, times = _swmm5_dates(tsd.index)
+            values = tsd.to_numpy(dtype="float64", na_value=np.nan)
+            for fpo, columns in targets:
+                rows = slice(None)
+                if outdir is not None:
+                    rows = ~np.isnan(values[:, columns]).any(axis=1)
+                frame = pd.DataFrame(values[rows][:, columns])
+                frame.insert(0, "time", times[rows])
+                frame.insert(0, "date", dates[rows])
+                frame.to_csv(
+                    fpo,
+                    float_format="%g",
+                    header=False,
+                    index=False,
+                    sep=" ",
+                    quoting=csv.QUOTE_NONE,
+                    lineterminator="\n",
+                )
+    finally:
+        if outdir is not None and targets is not None:
+            for fpo, _ in targets:
+                fpo.close()
+
+
+def _read_iso_chunks(input_ts, start_date=None, end_date=None, chunksize=100000):
+    """Read toolbox standard CSV in chunks of "chunksize" rows.
+
+    Only the rows between "start_date" and "end_date" are yielded, and
+    reading stops at the first chunk past "end_date", so the input must be
+    sorted by date.
+    """
+    if start_date is not None:
+        start_date = pd.Timestamp(tsutils.parsedate(start_date))
+    if end_date is not None:
+        end_date = pd.Timestamp(tsutils.parsedate(end_date))
+    if input_ts == "-":
+        input_ts = sys.stdin
+    with pd.read_csv(
+        input_ts,
+        index_col=0,
+        skipinitialspace=True,
+        chunksize=chunksize,
+    ) as reader:
+        for chunk in reader:
+            chunk.index = pd.to_datetime(chunk.index)
+            chunk.columns = [str(i).strip() for i in chunk.columns]
+            mask = np.ones(len(chunk), dtype=bool)
+            if start_date is not None:
+                mask &= chunk.index >= start_date
+            if end_date is not None:
+                mask &= chunk.index <= end_date
+            yield chunk[mask]
+            if end_date is not None and len(chunk) and chunk.index[-1] > end_date:
+                break
+
+
+@tsutils.doc(_LOCAL_DOCSTRINGS)
+def stdtoswmm5(
+    start_date=None,
+    end_date=None,
+    input_ts="-",
+    outdir=None,
+    chunksize=None,
+    stream=False,
+):
+    """Take the toolbox standard format and return SWMM5 format.
+
+    Toolbox standard::
+
+       Datetime, Column_Name
+       2000-01-01 00:00:00 ,  45.6
+       2000-01-01 01:00:00 ,  45.2
+       ...
+
+    SWMM5 format::
+
+       ; comment line
+       01/01/2000 00:00, 45.6
+       01/01/2000 01:00, 45.2
+       ...
+
+    Parameters
+    ----------
+    ${input_ts}
+    ${start_date}
+    ${end_date}
+    outdir : str
+        [optional, default is None]
+
+        If given, write each column to a separate SWMM5 time series file
+        named "<column>.dat" in the directory "outdir" instead of writing
+        all columns to stdout.
+    chunksize : int
+        [optional, default is None]
+
+        Number of rows to format and write at a time.  The default of None
+        uses 100000 rows.
+    stream : bool
+        [optional, default is False]
+
+        If True, read "input_ts" as comma separated values "chunksize" rows
+        at a time, so that memory use does not depend on the length of the
+        input.  The input must be sorted by date, and reading stops at
+        "end_date".  Only '-' (stdin) or the filename of a comma separated
+        values file can be used as "input_ts", without column selection or
+        other options.
+    """
+    sys.tracebacklimit = 1000
+    chunksize = 100000 if chunksize is None else int(chunksize)
+    if stream:
+        if not isinstance(input_ts, str) or (
+            input_ts != "-" and not os.path.isfile(input_ts)
+        ):
+            raise ValueError(
+                tsutils.error_wrapper(
+                    """
+                    With "stream" the "input_ts" must be '-' or the filename
+                    of a comma separated values file.  Column selection and
+                    other input formats need "stream" to be False.
+                    """
+                )
+            )
+        chunks = _read_iso_chunks(
+            input_ts, start_date=start_date, end_date=end_date, chunksize=chunksize
+        )
+    else:
+        tsd = tsutils.read_iso_ts(input_ts)[start_date:end_date]
+        chunks = (
+            tsd.iloc[row : row + chunksize]
+            for row in range(0, max(len(tsd), 1), chunksize)
+        )
+    try:
+        _write_swmm5(chunks, outdir=outdir)
+    except BrokenPipeError:
+        return
+
+
+def _label_matches(obj, labels):
+    """Yield the "resolve_label" matches of each of the "labels" of "extract"."""
+    if len(labels) == 1:
+        labels = labels[0]
+
+    if isinstance(labels, str):
+        labels = [labels]
+
+    label_list = []
+    for i in labels:
+        if isinstance(i, str):
+            label_list.append(i.split(","))
+        elif isinstance(i, (list, tuple)):
+            label_list.append(i)
+
+    for words in label_list:
+        words = [str(i) if i is not None else "" for i in words]
+        words = (words + ["", "", ""])[:3]
+        nlabels = obj.resolve_label(*words)
+        if not nlabels:
+            raise ValueError(
+                tsutils.error_wrapper(
+                    f"""
+                    The label "{",".join(words)}" does not match anything in
+                    the catalog.
+                    """
+                )
+            )
+        yield nlabels
 
-       Datetime, Column_Name
-       2000-01-01 00:00:00 ,  45.6
-       2000-01-01 01:00:00 ,  45.2
-       ...
 
-    SWMM5 format::
+def _resolve_labels(obj, labels):
+    """Resolve the "labels" of "extract" to value positions and column names."""
+    columns = []
+    column_names = []
+    for nlabels in _label_matches(obj, labels):
+        for itemtype, name, variablename, column in nlabels:
+            if itemtype == "system":
+                name = ""
+            columns.append(column)
+            column_names.append(f"{itemtype}_{name}_{variablename}")
 
-       ; comment line
-       01/01/2000 00:00, 45.6
-       01/01/2000 01:00, 45.2
-       ...
+    return (columns, column_names)
+
+
+@tsutils.doc(_LOCAL_DOCSTRINGS)
+def extract(
+    filename,
+    *labels,
+    start_date=None,
+    end_date=None,
+    stride=1,
+    workers=None,
+    executor="thread",
+    partition="periods",
+):
+    """
+    Get the time series data for a particular object and variable.
 
     Parameters
     ----------
-    ${input_ts}
+    ${filename}
+    ${labels}
     ${start_date}
     ${end_date}
+    ${stride}
+    ${workers}
+    executor : str
+        [optional, default is "thread"]
+
+        Use a pool of "thread" or "process" workers when "workers" is set.
+    partition : str
+        [optional, default is "periods"]
+
+        When "workers" is set, split the work across workers by contiguous
+        ranges of time "periods" or by "labels".
     """
-    sys.tracebacklimit = 1000
-    tsd = tsutils.read_iso_ts(input_ts)[start_date:end_date]
+    obj = _open(filename)
+
+    columns, column_names = _resolve_labels(obj, labels)
+
+    # Only the period records in the date range are read, and all requested
+    # columns are filled in a single pass over them.
+    start, stop = obj.period_range(start_date=start_date, end_date=end_date)
+    stride = int(stride)
+    if workers is not None and int(workers) > 1:
+        values = obj.get_swmm_values_parallel(
+            columns,
+            start=start,
+            stop=stop,
+            step=stride,
+            workers=workers,
+            executor=executor,
+            partition=partition,
+        )
+    else:
+        values = obj.get_swmm_values(columns, start=start, stop=stop, step=stride)
+
+    return pd.DataFrame(
+        values,
+        index=obj.get_dates(start=start, stop=stop, step=stride),
+        columns=column_names,
+        dtype="float64",
+    )
+
+
+@tsutils.doc(_LOCAL_DOCSTRINGS)
+def extract_chunks(
+    filename,
+    *labels,
+    start_date=None,
+    end_date=None,
+    stride=1,
+    chunksize=None,
+    as_numpy=False,
+):
+    """
+    Yield the time series data in blocks of time periods.
+
+    Reads the output file sequentially so that memory use is bounded by
+    "chunksize" regardless of the length of the simulation.  Concatenating
+    the yielded DataFrames gives the same result as "extract".
+
+    Parameters
+    ----------
+    ${filename}
+    ${labels}
+    ${start_date}
+    ${end_date}
+    ${stride}
+    ${chunksize}
+    as_numpy : bool
+        [optional, default is False]
+
+        If True yield (DatetimeIndex, column_names, values) tuples where
+        "values" is the float32 (periods, labels) numpy array, instead of a
+        DataFrame.
+    """
+    obj = _open(filename)
+
+    columns, column_names = _resolve_labels(obj, labels)
+
+    start, stop = obj.period_range(start_date=start_date, end_date=end_date)
+    for block, values in obj.iter_swmm_values(
+        columns, start=start, stop=stop, step=int(stride), chunksize=chunksize
+    ):
+        dates = obj.get_dates(start=block.start, stop=block.stop, step=block.step)
+        if as_numpy:
+            yield (dates, column_names, values)
+        else:
+            yield pd.DataFrame(
+                values, index=dates, columns=column_names, dtype="float64"
+            )
+
+
+@tsutils.doc(_LOCAL_DOCSTRINGS)
+def follow(filename, *labels, poll_interval=1.0, timeout=None):
+    """
+    Yield the time series data of a running simulation as it is written.
+
+    Meant for monitoring long simulations.  The output file is checked
+    every "poll_interval" seconds and a DataFrame of the periods completed
+    since the last check is yielded.  Stops after the last period when SWMM
+    finishes the output file.
+
+    Parameters
+    ----------
+    ${filename}
+    ${labels}
+    poll_interval : float
+        [optional, default is 1.0]
+
+        Seconds to wait between checks of the output file.
+    timeout : float
+        [optional, default is None]
+
+        Stop if the output file does not grow for "timeout" seconds.  The
+        default of None waits until SWMM finishes the output file.
+    """
+    poll_interval = float(poll_interval)
+    idle = 0.0
+    obj = None
     try:
-        # Header
-        print(";Datetime,", ", ".join(str(i) for i in tsd.columns))
-
-        # Data
-        cols = tsd.columns.tolist()
-        tsd["date_tmp_tstoolbox"] = tsd.index.format(
-            formatter=lambda x: x.strftime("%m/%d/%Y")
-        )
-        tsd["time_tmp_tstoolbox"] = tsd.index.format(
-            formatter=lambda x: x.strftime("%H:%M:%S")
-        )
-        tsd.to_csv(
-            sys.stdout,
-            float_format="%g",
-            header=False,
-            index=False,
-            cols=["date_tmp_tstoolbox", "time_tmp_tstoolbox"] + cols,
-            sep=" ",
-            quoting=csv.QUOTE_NONE,
+        while obj is None:
+            try:
+                obj = SwmmLiveExtract(filename)
+            except (EOFError, FileNotFoundError):
+                if timeout is not None and idle >= float(timeout):
+                    raise
+                time.sleep(poll_interval)
+                idle += poll_interval
+
+        columns, column_names = _resolve_labels(obj, labels)
+        start = 0
+        idle = 0.0
+        while True:
+            obj.refresh()
+            stop = obj.swmm_nperiods
+            if stop > start:
+                values = obj.get_swmm_values(columns, start=start, stop=stop)
+                dates = obj.get_dates(start=start, stop=stop)
+                start = stop
+                idle = 0.0
+                yield pd.DataFrame(
+                    values, index=dates, columns=column_names, dtype="float64"
+                )
+            elif obj.finished:
+                break
+            elif timeout is not None and idle >= float(timeout):
+                return
+            else:
+                time.sleep(poll_interval)
+                idle += poll_interval
+
+        if obj.errcode != 0:
+            raise ValueError(
+                tsutils.error_wrapper(
+                    f"""
+                    Error code "{obj.errcode}" in output file indicates a
+                    problem with the run.
+                    """
+                )
+            )
+    finally:
+        if obj is not None:
+            obj.close()
+
+
+@tsutils.doc(_LOCAL_DOCSTRINGS)
+def subset(
+    filename,
+    outfile,
+    *labels,
+    start_date=None,
+    end_date=None,
+    stride=1,
+    chunksize=None,
+):
+    """
+    Write a smaller SWMM output file with only some of the time series.
+
+    The period records are read from "filename" and written to "outfile"
+    a block at a time, so neither file has to fit in memory.  The new file
+    can be read like any other SWMM output file.
+
+    Every element of a type has the same variables in a SWMM output file,
+    so for each type the new file has all of the selected elements with
+    all of the variables selected for that type.  All of the pollutant
+    names are kept so that the pollutant variables keep their names.
+
+    Parameters
+    ----------
+    ${filename}
+    outfile : str
+        Filename of the new SWMM output file.  Overwritten if it already
+        exists.
+    ${labels}
+    ${start_date}
+    ${end_date}
+    stride : int
+        [optional, default is 1]
+
+        Only keep every "stride" time period, starting with the first time
+        period on or after "start_date".  The report interval of the new
+        file is "stride" times the original report interval.
+    ${chunksize}
+    """
+    obj = _open(filename)
+
+    items = {0: set(), 1: set(), 2: set()}
+    variables = {0: set(), 1: set(), 2: set(), 4: set()}
+    for nlabels in _label_matches(obj, labels):
+        for itemtype, name, variablename, _ in nlabels:
+            typenumber = obj.type_check(itemtype)
+            variables[typenumber].add(obj.variable_index[typenumber][variablename])
+            if typenumber != 4:
+                items[typenumber].add(obj.name_index[typenumber][name])
+    items = {i: sorted(j) for i, j in items.items()}
+    variables = {i: sorted(j) for i, j in variables.items()}
+
+    columns = [
+        obj.value_index(typenumber, itemindex, variableindex)
+        for typenumber in (0, 1, 2)
+        for itemindex in items[typenumber]
+        for variableindex in variables[typenumber]
+    ]
+    columns.extend(obj.value_index(4, 0, i) for i in variables[4])
+
+    start, stop = obj.period_range(start_date=start_date, end_date=end_date)
+    stride = int(stride)
+    if not range(obj.swmm_nperiods)[start:stop:stride]:
+        raise ValueError(
+            tsutils.error_wrapper(
+                f"""
+                There are no time periods between "{start_date}" and
+                "{end_date}".
+                """
+            )
         )
-    except OSError:
-        return
+    reportinterval = obj.reportinterval * stride
+    startdate = obj.get_dates(start=start, stop=start + 1)[0] - reportinterval
+
+    names = {i: [obj.names[i][j] for j in items[i]] for i in (0, 1, 2)}
+    names[3] = obj.names[3]
+    with SwmmWriter(
+        outfile,
+        names,
+        {i: [obj.vars[i][j] for j in variables[i]] for i in (0, 1, 2, 4)},
+        startdate,
+        reportinterval,
+        propcode=obj.propcode,
+        prop={i: obj.prop[i][items[i]] for i in (0, 1, 2)},
+        pollutant_codes=obj.pollutant_codes,
+        version=obj.version,
+        flowunits=obj.swmm_flowunits,
+    ) as writer:
+        for block, values in obj.iter_swmm_values(
+            columns, start=start, stop=stop, step=stride, chunksize=chunksize
+        ):
+            writer.write(
+                values,
+                dates=obj.get_dates(
+                    start=block.start, stop=block.stop, step=block.step
+                ),
+            )
 
 
 @tsutils.doc(_LOCAL_DOCSTRINGS)
-def extract(filename, *labels):
+def summarize(
+    filename,
+    *labels,
+    start_date=None,
+    end_date=None,
+    stride=1,
+    threshold=None,
+    chunksize=None,
+):
     """
-    Get the time series data for a particular object and variable.
+    Summary statistics of each time series, computed in one pass.
+
+    The period records are read sequentially in blocks of "chunksize" and
+    the statistics of all labels are accumulated block by block, so a
+    label like "link,,Flow_rate" summarizes every link of a large network
+    with one read of the output file and memory proportional to the number
+    of links.
 
     Parameters
     ----------
     ${filename}
     ${labels}
+    ${start_date}
+    ${end_date}
+    ${stride}
+    threshold : float
+        [optional, default is None]
+
+        If given, also report "hours_above", the time in hours that each
+        time series is greater than "threshold".
+    ${chunksize}
+
+    Returns
+    -------
+    DataFrame
+        One row for each label, named like the columns of "extract", with
+        the columns "minimum", "maximum", "maximum_time", "mean", and
+        "total", the time integral of the values in value units times
+        seconds.  For "Flow_rate" this is the total volume.
+    """
+    obj = _open(filename)
+
+    columns, column_names = _resolve_labels(obj, labels)
+
+    start, stop = obj.period_range(start_date=start_date, end_date=end_date)
+    stride = int(stride)
+    ncolumns = len(columns)
+    minimum = np.full(ncolumns, np.inf)
+    maximum = np.full(ncolumns, -np.inf)
+    maximum_period = np.zeros(ncolumns, dtype="int64")
+    total = np.zeros(ncolumns)
+    above = np.zeros(ncolumns, dtype="int64")
+    count = 0
+    for block, values in obj.iter_swmm_values(
+        columns, start=start, stop=stop, step=stride, chunksize=chunksize
+    ):
+        np.minimum(minimum, values.min(axis=0), out=minimum)
+        rows = values.argmax(axis=0)
+        peaks = values[rows, np.arange(ncolumns)]
+        new = peaks > maximum
+        maximum[new] = peaks[new]
+        maximum_period[new] = np.asarray(block)[rows[new]]
+        total += values.sum(axis=0, dtype="f8")
+        if threshold is not None:
+            above += (values > float(threshold)).sum(axis=0)
+        count += len(block)
+
+    if count == 0:
+        raise ValueError(
+            tsutils.error_wrapper(
+                f"""
+                There are no time periods between "{start_date}" and
+                "{end_date}".
+                """
+            )
+        )
+
+    seconds = obj.reportinterval.total_seconds() * stride
+    summary = pd.DataFrame(
+        {
+            "minimum": minimum,
+            "maximum": maximum,
+            "maximum_time": obj.dates_at(maximum_period),
+            "mean": total / count,
+            "total": total * seconds,
+        },
+        index=pd.Index(column_names, name="label"),
+    )
+    if threshold is not None:
+        summary["hours_above"] = above * seconds / 3600
+    return summary
+
 
+@tsutils.doc(_LOCAL_DOCSTRINGS)
+def iter_frames(filename, itemtype="", start_date=None, end_date=None, stride=1):
     """
-    obj = SwmmExtract(filename)
+    Yield the values of all elements for successive time periods.
 
-    if len(labels) == 1:
-        labels = labels[0]
+    Meant for rendering one frame per reported period.  The period records
+    are read in order into a single preallocated float32 buffer, so no
+    arrays are allocated while iterating.
 
-    if isinstance(labels, str):
-        labels = [labels]
+    Parameters
+    ----------
+    ${filename}
+    itemtype : str
+        [optional, default is "", all types]
 
-    label_list = []
-    for i in labels:
-        if isinstance(i, str):
-            label_list.append(i.split(","))
-        elif isinstance(i, (list, tuple)):
-            label_list.append(i)
+        One of 'subcatchment', 'node', 'link', or 'system'.
+    ${start_date}
+    ${end_date}
+    ${stride}
+
+    Yields
+    ------
+    tuple
+        The (date, frame) of each period, where "frame" is a dictionary of
+        item type name to a (elements, variables) float32 array.  The rows
+        are in the order of "SwmmExtract.names" and the columns in the order
+        of "listvariables".  The system variables are a single row.  The
+        arrays are views of the buffer and are overwritten by the next
+        period, so copy any that need to be kept.
+    """
+    obj = _open(filename)
 
-    nlabels = []
-    for words in label_list:
-        with suppress(ValueError, TypeError):
-            words[2] = str(words[2])
-            typenumber = obj.type_check(words[2])
-            words[2] = obj.varcode[typenumber][words[2]]
-        words = [str(i) if i is not None else None for i in words]
-        res = tuple_search(words, catalog(filename))
-        nlabels = nlabels + res
-    jtsd = []
-
-    for itemtype, name, variablename in nlabels:
-        typenumber = obj.type_check(itemtype)
+    if itemtype:
+        typenumbers = [obj.type_check(itemtype)]
+    else:
+        typenumbers = [0, 1, 2, 4]
+
+    buffer = np.empty((obj.bytesperperiod - 2 * obj.record_size) // 4, dtype="f4")
+    frame = {}
+    for typenumber in typenumbers:
+        if typenumber == 3:
+            raise ValueError(
+                tsutils.error_wrapper(
+                    """
+                    The pollutant values are variables of subcatchments,
+                    nodes, and links, use one of those item types.
+                    """
+                )
+            )
+        nitems = 1 if typenumber == 4 else len(obj.names[typenumber])
+        nvars = len(obj.vars[typenumber])
+        offset = obj.value_index(typenumber, 0, 0)
+        frame[obj.itemlist[typenumber]] = buffer[
+            offset : offset + nitems * nvars
+        ].reshape(nitems, nvars)
 
-        name = obj.name_check(itemtype, name)[0]
+    start, stop = obj.period_range(start_date=start_date, end_date=end_date)
+    periods = range(obj.swmm_nperiods)[start : stop : int(stride)]
+    dates = obj.get_dates(start=start, stop=stop, step=int(stride))
+    for period, date in zip(periods, dates):
+        obj.get_swmm_period(period, out=buffer)
+        yield (date, frame)
 
-        inv_varcode_map = dict(
-            zip(obj.varcode[typenumber].values(), obj.varcode[typenumber].keys())
+
+@tsutils.doc(_LOCAL_DOCSTRINGS)
+def snapshot(filename, itemtype, variable, time):
+    """
+    Get the values of every element of one type at one time.
+
+    Only the one period record at "time" is read from the output file, so
+    the cost depends on the size of the network, not the length of the
+    simulation.
+
+    Parameters
+    ----------
+    ${filename}
+    ${itemtype}
+    variable : str
+        The name or index of the variable.  An empty string returns all of
+        the variables of "itemtype".
+    time : str
+        The date and time.  The values of the last reported period on or
+        before "time" are returned.
+
+    Returns
+    -------
+    DataFrame
+        One row for each element of "itemtype", in the order of "catalog",
+        and one column for each variable.  The system variables are a
+        single row named "system".
+    """
+    obj = _open(filename)
+
+    if not itemtype or obj.type_check(itemtype) == 3:
+        raise ValueError(
+            tsutils.error_wrapper(
+                f"""
+                The itemtype "{itemtype}" must be one of 'subcatchment',
+                'node', 'link', or 'system'.  The pollutant values are
+                variables of subcatchments, nodes, and links.
+                """
+            )
         )
-        try:
-            variableindex = inv_varcode_map[int(variablename)]
-        except ValueError:
-            variableindex = inv_varcode_map[variablename]
-
-        begindate = datetime.datetime(1899, 12, 30)
-        dates = []
-        values = []
-        for time in range(obj.swmm_nperiods):
-            date, value = obj.get_swmm_results(typenumber, name, variableindex, time)
-            days = int(date)
-            seconds = int((date - days) * 86400)
-            extra = seconds % 10
-            if extra == 1:
-                seconds -= 1
-            elif extra == 9:
-                seconds += 1
-            date = begindate + datetime.timedelta(days=days, seconds=seconds)
-            dates.append(date)
-            values.append(value)
-        if itemtype == "system":
-            name = ""
-        jtsd.append(
-            pd.DataFrame(
-                pd.Series(values, index=dates),
-                columns=[f"{itemtype}_{name}_{obj.varcode[typenumber][variableindex]}"],
-            )
-        )
-    return pd.concat(jtsd, axis=1).reindex(jtsd[0].index)
+
+    nlabels = obj.resolve_label(itemtype, "", variable)
+    if not nlabels:
+        raise ValueError(
+            tsutils.error_wrapper(
+                f"""
+                There are no values for itemtype "{itemtype}" and variable
+                "{variable}".
+                """
+            )
+        )
+
+    values = obj.get_swmm_period(obj.period_at(time))[[i[3] for i in nlabels]]
+    variables = list(dict.fromkeys(i[2] for i in nlabels))
+    if nlabels[0][0] == "system":
+        names = ["system"]
+    else:
+        names = list(dict.fromkeys(i[1] for i in nlabels))
+    return pd.DataFrame(
+        values.reshape(len(names), len(variables)),
+        index=pd.Index(names, name="name"),
+        columns=variables,
+        dtype="float64",
+    )
+
+
+# The result of "extract_ensemble".
+Ensemble = collections.namedtuple("Ensemble", ["data", "filenames", "index", "columns"])
+
+
+def _check_same_layout(obj, reference):
+    """Raise a ValueError if "obj" does not have the layout of "reference"."""
+    for attr in (
+        "swmm_nsubcatch",
+        "swmm_nnodes",
+        "swmm_nlinks",
+        "swmm_npolluts",
+        "swmm_nperiods",
+        "bytesperperiod",
+        "startdate",
+        "reportinterval",
+        "vars",
+        "names",
+    ):
+        if getattr(obj, attr) != getattr(reference, attr):
+            raise ValueError(
+                tsutils.error_wrapper(
+                    f"""
+                    The "{attr}" of "{obj.filename}" is different from
+                    "{reference.filename}".  All files of an ensemble must
+                    have the same layout.
+                    """
+                )
+            )
+
+
+@tsutils.doc(_LOCAL_DOCSTRINGS)
+def extract_ensemble(
+    filenames, *labels, start_date=None, end_date=None, stride=1, workers=None
+):
+    """
+    Extract the same labels from many output files into one array.
+
+    Meant for Monte Carlo and scenario studies where every output file comes
+    from the same network.  The labels are resolved once against the first
+    file and the same positions are read from every file after checking that
+    it has the same counts, names, variables, and time periods.
+
+    Parameters
+    ----------
+    filenames : list or str
+        List of SWMM output files, or a glob pattern such as "runs/*.out".
+    ${labels}
+    ${start_date}
+    ${end_date}
+    ${stride}
+    workers : int
+        [optional, default is None]
+
+        Number of threads used to read files in parallel.  The default of
+        None reads one file at a time.
+
+    Returns
+    -------
+    Ensemble
+        Named tuple of "data", the float32 (file, period, label) array,
+        "filenames", "index", the DatetimeIndex of the periods, and
+        "columns", the label names.
+    """
+    if isinstance(filenames, (str, os.PathLike)):
+        filenames = sorted(glob.glob(os.fspath(filenames)))
+    filenames = list(filenames)
+    if not filenames:
+        raise ValueError(
+            tsutils.error_wrapper(
+                """
+                No files were given to "extract_ensemble".
+                """
+            )
+        )
+
+    # The reference stays open until every file is checked against its
+    # lazily read layout.
+    with _open_reader(filenames[0]) as reference:
+        columns, column_names = _resolve_labels(reference, labels)
+        start, stop = reference.period_range(start_date=start_date, end_date=end_date)
+        stride = int(stride)
+        index = reference.get_dates(start=start, stop=stop, step=stride)
+
+        data = np.empty((len(filenames), len(index), len(columns)), dtype="f4")
+
+        def read(number):
+            with _open_reader(filenames[number]) as obj:
+                _check_same_layout(obj, reference)
+                data[number] = obj.get_swmm_values(
+                    columns, start=start, stop=stop, step=stride
+                )
+
+        if workers is not None and int(workers) > 1:
+            with ThreadPoolExecutor(max_workers=int(workers)) as pool:
+                list(pool.map(read, range(len(filenames))))
+        else:
+            for number in range(len(filenames)):
+                read(number)
+
+    return Ensemble(data, filenames, index, column_names)
+
+
+class AsyncSwmmExtract:
+    """Asyncio wrapper of an open "SwmmExtract".
+
+    The file reads run in "executor", a concurrent.futures executor, or the
+    default executor of the event loop if None, so they do not block the
+    event loop.  Use "await AsyncSwmmExtract.open(filename)" to also parse
+    the header in the executor.
+    """
+
+    def __init__(self, obj, executor=None):
+        if not isinstance(obj, SwmmExtract):
+            obj = _open_reader(obj)
+        self.obj = obj
+        self.executor = executor
+
+    @classmethod
+    async def open(cls, filename, executor=None):
+        """Open "filename" in the executor and return an AsyncSwmmExtract."""
+        obj = await cls._run_in(executor, _open_reader, filename)
+        return cls(obj, executor=executor)
+
+    @staticmethod
+    async def _run_in(executor, func, *args, **kwds):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            executor, functools.partial(func, *args, **kwds)
+        )
+
+    async def _run(self, func, *args, **kwds):
+        return await self._run_in(self.executor, func, self.obj, *args, **kwds)
+
+    async def catalog(self, itemtype=""):
+        """Asyncio flavor of "catalog"."""
+        return await self._run(catalog, itemtype=itemtype)
+
+    async def listdetail(self, itemtype, name="", header="default"):
+        """Asyncio flavor of "listdetail"."""
+        return await self._run(listdetail, itemtype, name=name, header=header)
+
+    async def listvariables(self, header="default"):
+        """Asyncio flavor of "listvariables"."""
+        return await self._run(listvariables, header=header)
+
+    async def extract(self, *labels, **kwds):
+        """Asyncio flavor of "extract", takes the same keywords."""
+        return await self._run(extract, *labels, **kwds)
+
+    async def close(self):
+        """Close the output file."""
+        await self._run_in(self.executor, self.obj.close)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        await self.close()
+
+
+async def extract_async(filename, *labels, executor=None, **kwds):
+    """Asyncio flavor of "extract".
+
+    The file is opened and read in "executor", or the default executor of
+    the event loop if None.  Takes the same keywords as "extract".
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        executor, functools.partial(extract, filename, *labels, **kwds)
+    )
+
+
+async def extract_many_async(
+    filenames, *labels, combine=False, executor=None, max_concurrency=None, **kwds
+):
+    """Extract the same labels from many output files concurrently.
+
+    Returns a list with one DataFrame per file in the order of "filenames",
+    or if "combine" is True a single DataFrame with (filename, label)
+    MultiIndex columns.  At most "max_concurrency" files are read at once
+    if given.  Takes the same keywords as "extract".
+    """
+    filenames = list(filenames)
+    semaphore = asyncio.Semaphore(max_concurrency) if max_concurrency else None
+
+    async def one(filename):
+        if semaphore is None:
+            return await extract_async(filename, *labels, executor=executor, **kwds)
+        async with semaphore:
+            return await extract_async(filename, *labels, executor=executor, **kwds)
+
+    results = await asyncio.gather(*(one(i) for i in filenames))
+    if combine:
+        return pd.concat(
+            results,
+            axis=1,
+            keys=[getattr(i, "filename", i) for i in filenames],
+            names=["filename", "label"],
+        )
+    return list(results)
+
+
+@tsutils.doc(_LOCAL_DOCSTRINGS)
+def convert(filename, outdir, chunksize=None):
+    """Convert a SWMM output file to a column oriented store.
+
+    SWMM writes all values of one time period together, so reading the
+    series of one variable touches every period record.  The column store
+    keeps blocks of "chunksize" periods transposed so the series of a
+    variable is contiguous, which makes extracting a few labels much faster.
+    The output file is read sequentially, one block at a time, so it can be
+    larger than memory.
+
+    The store is a directory that can be used in place of the SWMM output
+    filename in "catalog", "listdetail", "listvariables", and "extract".
+    The header, including names, properties, and variable codes, is kept as
+    JSON in "swmmtoolbox.json".
+
+    Parameters
+    ----------
+    ${filename}
+    outdir : str
+        Directory to write the column store.  Created if it does not
+        exist.
+    chunksize : int
+        [optional, default is None]
+
+        Number of time periods in each values file.  The default of None
+        sizes the files to about 256 MB.
+    """
+    obj = _open(filename)
+    if isinstance(obj, SwmmColumnStore):
+        raise TypeError(
+            tsutils.error_wrapper(
+                f"""
+                "{obj.filename}" is already a column store.
+                """
+            )
+        )
+    if chunksize is None:
+        chunksize = obj.chunk_periods(256 * 1024**2)
+
+    os.makedirs(outdir, exist_ok=True)
+    # Remove the metadata of a previous conversion before overwriting its
+    # values files.
+    with suppress(FileNotFoundError):
+        os.remove(os.path.join(outdir, _STORE_METADATA))
+    np.save(os.path.join(outdir, "dates.npy"), np.array(obj.results["date"]))
+    chunks = []
+    for number, block in enumerate(obj.period_blocks(chunksize=int(chunksize))):
+        name = f"values_{number:05d}.npy"
+        values = obj.results["values"][block.start : block.stop]
+        np.save(os.path.join(outdir, name), np.ascontiguousarray(values.T))
+        chunks.append([block.start, len(block), name])
+
+    # The metadata is written last so that an incomplete conversion is not
+    # mistaken for a column store.
+    with open(os.path.join(outdir, _STORE_METADATA), "w", encoding="utf-8") as fpm:
+        json.dump(
+            {
+                "format": _STORE_FORMAT,
+                "source": os.path.abspath(obj.filename) if obj.filename else None,
+                "nperiods": obj.swmm_nperiods,
+                "chunks": chunks,
+                "meta": obj.header_metadata(),
+            },
+            fpm,
+        )
+
+
+_OUTPUT_FORMATS = ("csv", "parquet", "feather", "npz")
+
+
+def _check_output_format(output_format, output):
+    """Check the "output_format" and "output" options of the command line."""
+    if output_format not in _OUTPUT_FORMATS:
+        raise ValueError(
+            tsutils.error_wrapper(
+                f"""
+                The output format "{output_format}" must be one of
+                {_OUTPUT_FORMATS}.
+                """
+            )
+        )
+    if output_format != "csv" and output is None:
+        raise ValueError(
+            tsutils.error_wrapper(
+                f"""
+                The "{output_format}" output format requires an "output"
+                filename.
+                """
+            )
+        )
+
+
+def _import_pyarrow(output_format):
+    """Import the optional "pyarrow" package."""
+    try:
+        import pyarrow as pa
+        import pyarrow.ipc
+        import pyarrow.parquet
+    except ImportError as exc:
+        raise ImportError(
+            f"""
+The "{output_format}" output format requires the "pyarrow" package, install
+it with "pip install swmmtoolbox[arrow]".
+"""
+        ) from exc
+    return pa
+
+
+def _write_values(chunks, output, output_format, empty):
+    """Write the (dates, column_names, values) "chunks" of "extract_chunks".
+
+    The float32 values are written directly, without formatting text.  If
+    there are no chunks the "empty" chunk is written, so that the file has
+    the columns even if no time periods were selected.
+    """
+    chunks = iter(chunks)
+    first = next(chunks, None)
+    chunks = itertools.chain([empty if first is None else first], chunks)
+
+    if output_format == "npz":
+        chunks = list(chunks)
+        np.savez_compressed(
+            output,
+            dates=np.concatenate([np.asarray(i[0]) for i in chunks]),
+            values=np.concatenate([i[2] for i in chunks]),
+            columns=np.array(chunks[0][1], dtype=str),
+        )
+        return
+
+    if output_format == "csv":
+        with open(output, "w", encoding="utf-8", newline="") as fpo:
+            header = True
+            for dates, column_names, values in chunks:
+                frame = pd.DataFrame(values, index=dates, columns=column_names)
+                frame.index.name = "Datetime"
+                frame.to_csv(fpo, float_format="%g", header=header)
+                header = False
+        return
+
+    pa = _import_pyarrow(output_format)
+    writer = None
+    try:
+        for dates, column_names, values in chunks:
+            batch = pa.RecordBatch.from_arrays(
+                [pa.array(np.asarray(dates))]
+                + [pa.array(values[:, i]) for i in range(values.shape[1])],
+                names=["Datetime", *column_names],
+            )
+            if writer is None:
+                if output_format == "parquet":
+                    writer = pa.parquet.ParquetWriter(output, batch.schema)
+                else:
+                    writer = pa.ipc.new_file(output, batch.schema)
+            writer.write_batch(batch)
+    finally:
+        if writer is not None:
+            writer.close()
+
+
+def _write_catalog(rows, output, output_format):
+    """Write the rows of "catalog" as TYPE, NAME, and VARIABLE columns."""
+    columns = {
+        key: [i[number] for i in rows]
+        for number, key in enumerate(["TYPE", "NAME", "VARIABLE"])
+    }
+    if output_format == "npz":
+        np.savez_compressed(
+            output,
+            **{key: np.array(value, dtype=str) for key, value in columns.items()},
+        )
+    elif output_format == "csv":
+        pd.DataFrame(columns).to_csv(output, index=False)
+    else:
+        pa = _import_pyarrow(output_format)
+        table = pa.table(columns)
+        if output_format == "parquet":
+            pa.parquet.write_table(table, output)
+        else:
+            with pa.ipc.new_file(output, table.schema) as writer:
+                writer.write_table(table)
+
+
+def _cli_doc(source, *keys):
+    """Copy the docstring of "source" and document command line only "keys".
+
+    The entries are added at the end of the parameters, before any
+    "Returns" or "Yields" section.
+    """
+
+    def wrapper(func):
+        doc = source.__doc__.rstrip() + "\n"
+        rest = ""
+        for section in ("Returns", "Yields"):
+            marker = f"\n    {section}\n    ---"
+            if marker in doc:
+                doc, rest = doc.split(marker, 1)
+                doc = doc.rstrip() + "\n"
+                rest = "\n" + marker + rest
+                break
+        for key in keys:
+            doc += "    " + _LOCAL_DOCSTRINGS[key].rstrip() + "\n"
+        func.__doc__ = doc + rest + "    "
+        return func
+
+    return wrapper
 
 
 def main():
@@ -740,9 +3114,20 @@ def main():
         pprint(about())
 
     @cltoolbox.command("catalog", formatter_class=RSTHelpFormatter)
-    @tsutils.copy_doc(catalog)
-    def catalog_cli(filename, itemtype="", tablefmt="csv_nos", header="default"):
+    @_cli_doc(catalog, "output_format", "output")
+    def catalog_cli(
+        filename,
+        itemtype="",
+        tablefmt="csv_nos",
+        header="default",
+        output_format="csv",
+        output=None,
+    ):
         """List the catalog in a SWMM5 file."""
+        _check_output_format(output_format, output)
+        if output is not None:
+            _write_catalog(catalog(filename, itemtype=itemtype), output, output_format)
+            return
         if header == "default":
             header = ["TYPE", "NAME", "VARIABLE"]
         tsutils.printiso(
@@ -750,10 +3135,94 @@ def main():
         )
 
     @cltoolbox.command("extract", formatter_class=RSTHelpFormatter)
-    @tsutils.copy_doc(extract)
-    def extract_cli(filename, *labels):
+    @_cli_doc(extract, "chunksize", "output_format", "output")
+    def extract_cli(
+        filename,
+        start_date=None,
+        end_date=None,
+        stride=1,
+        chunksize=None,
+        workers=None,
+        output_format="csv",
+        output=None,
+        *labels,
+    ):
         """Get the time series data for a particular object and variable."""
-        tsutils.printiso(extract(filename, labels))
+        # The options come before "*labels" because cltoolbox passes all
+        # arguments positionally.
+        _check_output_format(output_format, output)
+        if output is not None:
+            obj = _open(filename)
+            _, column_names = _resolve_labels(obj, labels)
+            _write_values(
+                extract_chunks(
+                    obj,
+                    labels,
+                    start_date=start_date,
+                    end_date=end_date,
+                    stride=stride,
+                    chunksize=None if chunksize is None else int(chunksize),
+                    as_numpy=True,
+                ),
+                output,
+                output_format,
+                (
+                    obj.get_dates(stop=0),
+                    column_names,
+                    np.empty((0, len(column_names)), dtype="f4"),
+                ),
+            )
+            return
+        if chunksize is not None:
+            # Streaming mode, only "chunksize" periods are in memory at once.
+            header = True
+            for chunk in extract_chunks(
+                filename,
+                labels,
+                start_date=start_date,
+                end_date=end_date,
+                stride=stride,
+                chunksize=int(chunksize),
+            ):
+                chunk.index.name = "Datetime"
+                try:
+                    chunk.to_csv(sys.stdout, float_format="%g", header=header)
+                except OSError:
+                    return
+                header = False
+            return
+        tsutils.printiso(
+            extract(
+                filename,
+                labels,
+                start_date=start_date,
+                end_date=end_date,
+                stride=stride,
+                workers=workers,
+            )
+        )
+
+    @cltoolbox.command("convert", formatter_class=RSTHelpFormatter)
+    @tsutils.copy_doc(convert)
+    def convert_cli(filename, outdir, chunksize=None):
+        """Convert a SWMM output file to a column oriented store."""
+        convert(filename, outdir, chunksize=chunksize)
+
+    @cltoolbox.command("follow", formatter_class=RSTHelpFormatter)
+    @tsutils.copy_doc(follow)
+    def follow_cli(filename, poll_interval=1.0, timeout=None, *labels):
+        """Yield the time series data of a running simulation as it is written."""
+        header = True
+        for chunk in follow(
+            filename, labels, poll_interval=poll_interval, timeout=timeout
+        ):
+            chunk.index.name = "Datetime"
+            try:
+                chunk.to_csv(sys.stdout, float_format="%g", header=header)
+                sys.stdout.flush()
+            except OSError:
+                return
+            header = False
 
     @cltoolbox.command("listdetail", formatter_class=RSTHelpFormatter)
     @tsutils.copy_doc(listdetail)
@@ -771,12 +3240,80 @@ def main():
         """List the variables in a SWMM5 file."""
         tsutils.printiso(listvariables(filename, header=header), tablefmt=tablefmt)
 
+    @cltoolbox.command("subset", formatter_class=RSTHelpFormatter)
+    @tsutils.copy_doc(subset)
+    def subset_cli(
+        filename,
+        outfile,
+        start_date=None,
+        end_date=None,
+        stride=1,
+        chunksize=None,
+        *labels,
+    ):
+        """Write a smaller SWMM output file with only some of the time series."""
+        subset(
+            filename,
+            outfile,
+            labels,
+            start_date=start_date,
+            end_date=end_date,
+            stride=stride,
+            chunksize=None if chunksize is None else int(chunksize),
+        )
+
+    @cltoolbox.command("summarize", formatter_class=RSTHelpFormatter)
+    @_cli_doc(summarize, "tablefmt")
+    def summarize_cli(
+        filename,
+        start_date=None,
+        end_date=None,
+        stride=1,
+        threshold=None,
+        chunksize=None,
+        tablefmt="csv",
+        *labels,
+    ):
+        """Summary statistics of each time series, computed in one pass."""
+        tsutils.printiso(
+            summarize(
+                filename,
+                labels,
+                start_date=start_date,
+                end_date=end_date,
+                stride=stride,
+                threshold=threshold,
+                chunksize=None if chunksize is None else int(chunksize),
+            ),
+            tablefmt=tablefmt,
+        )
+
+    @cltoolbox.command("snapshot", formatter_class=RSTHelpFormatter)
+    @_cli_doc(snapshot, "tablefmt")
+    def snapshot_cli(filename, itemtype, variable, time, tablefmt="csv"):
+        """Get the values of every element of one type at one time."""
+        tsutils.printiso(
+            snapshot(filename, itemtype, variable, time), tablefmt=tablefmt
+        )
+
     @cltoolbox.command("stdtoswmm5", formatter_class=RSTHelpFormatter)
     @tsutils.copy_doc(stdtoswmm5)
-    def stdtoswmm5_cli(start_date=None, end_date=None, input_ts="-"):
+    def stdtoswmm5_cli(
+        start_date=None,
+        end_date=None,
+        input_ts="-",
+        outdir=None,
+        chunksize=None,
+        stream=False,
+    ):
         """Convert standard time series to SWMM5 time series."""
-        tsutils.printiso(
-            stdtoswmm5(start_date=start_date, end_date=end_date, input_ts=input_ts)
+        stdtoswmm5(
+            start_date=start_date,
+            end_date=end_date,
+            input_ts=input_ts,
+            outdir=outdir,
+            chunksize=chunksize,
+            stream=stream,
         )
 
     cltoolbox.main()
@@ -0,0 +1,52 @@
+"""
+test_async
+----------------------------------
+
+Tests for the asyncio API of `swmmtoolbox`.
+"""
+
+import asyncio
+
+import pandas as pd
+
+from swmmtoolbox import swmmtoolbox
+
+frutal = "tests/frutal.out"
+labels = ["link,222,Flow_rate", "node,222,Hydraulic_head"]
+
+
+def test_extract_async():
+    result = asyncio.run(swmmtoolbox.extract_async(frutal, labels, stride=2))
+    pd.testing.assert_frame_equal(result, swmmtoolbox.extract(frutal, labels, stride=2))
+
+
+def test_extract_many_async():
+    expected = swmmtoolbox.extract(frutal, labels)
+
+    results = asyncio.run(
+        swmmtoolbox.extract_many_async([frutal, frutal], labels, max_concurrency=1)
+    )
+    assert len(results) == 2
+    for result in results:
+        pd.testing.assert_frame_equal(result, expected)
+
+    combined = asyncio.run(
+        swmmtoolbox.extract_many_async(
+            [frutal, "tests/../tests/frutal.out"], labels, combine=True
+        )
+    )
+    assert combined.columns.names == ["filename", "label"]
+    pd.testing.assert_frame_equal(combined[frutal].rename_axis(columns=None), expected)
+
+
+def test_async_swmmextract():
+    async def run():
+        async with await swmmtoolbox.AsyncSwmmExtract.open(frutal) as obj:
+            catalog = await obj.catalog("node")
+            result = await obj.extract(labels)
+        assert obj.obj.closed
+        return catalog, result
+
+    catalog, result = asyncio.run(run())
+    assert catalog == swmmtoolbox.catalog(frutal, "node")
+    pd.testing.assert_frame_equal(result, swmmtoolbox.extract(frutal, labels))
@@ -0,0 +1,69 @@
+"""
+test_convert
+----------------------------------
+
+Tests for the column store written by `convert`.
+"""
+
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from swmmtoolbox import swmmtoolbox
+
+frutal = "tests/frutal.out"
+labels = ["link,,Flow_rate", "node,222,", "system,,Rainfall"]
+
+
+@pytest.fixture(params=[7, None], ids=["chunksize_7", "chunksize_default"])
+def store(request, tmp_path):
+    outdir = str(tmp_path / "frutal")
+    swmmtoolbox.convert(frutal, outdir, chunksize=request.param)
+    return outdir
+
+
+def test_convert_extract(store):
+    pd.testing.assert_frame_equal(
+        swmmtoolbox.extract(store, labels), swmmtoolbox.extract(frutal, labels)
+    )
+    pd.testing.assert_frame_equal(
+        swmmtoolbox.extract(
+            store, labels, start_date="2012-11-19 01:05", stride=4, workers=2
+        ),
+        swmmtoolbox.extract(frutal, labels, start_date="2012-11-19 01:05", stride=4),
+    )
+
+
+def test_convert_metadata(store):
+    assert swmmtoolbox.catalog(store) == swmmtoolbox.catalog(frutal)
+    assert swmmtoolbox.listvariables(store) == swmmtoolbox.listvariables(frutal)
+    pd.testing.assert_frame_equal(
+        swmmtoolbox.listdetail(store, "link"), swmmtoolbox.listdetail(frutal, "link")
+    )
+
+
+def test_convert_snapshot(store):
+    pd.testing.assert_frame_equal(
+        swmmtoolbox.snapshot(store, "node", "", "2012-11-19 14:35"),
+        swmmtoolbox.snapshot(frutal, "node", "", "2012-11-19 14:35"),
+    )
+
+
+def test_convert_interrupted(store, monkeypatch):
+    save = np.save
+
+    def interrupted_save(filename, values):
+        if os.path.basename(filename).startswith("values_00001"):
+            raise KeyboardInterrupt
+        save(filename, values)
+
+    monkeypatch.setattr(np, "save", interrupted_save)
+
+    # Act
+    with pytest.raises(KeyboardInterrupt):
+        swmmtoolbox.convert(frutal, store, chunksize=7)
+
+    # Assert
+    assert not os.path.exists(os.path.join(store, "swmmtoolbox.json"))
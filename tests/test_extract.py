@@ -6,11 +6,25 @@ Tests for `swmmtoolbox` module.
 """
 
 import shlex
+import shutil
+from io import BytesIO
 
+import numpy as np
 import pandas as pd
 import pytest
 
-from swmmtoolbox.swmmtoolbox import extract
+from swmmtoolbox import swmmtoolbox
+from swmmtoolbox.swmmtoolbox import (
+    SwmmExtract,
+    _decode_dates,
+    catalog,
+    extract,
+    extract_chunks,
+    extract_ensemble,
+    iter_frames,
+    snapshot,
+    summarize,
+)
 
 try:
     from cStringIO import StringIO
@@ -95,3 +109,410 @@ def test_extract_python_api(filename, labels, expected_output):
         assert result is None
     else:
         pd.testing.assert_frame_equal(result, expected_output)
+
+
+@pytest.mark.parametrize(
+    "start_date, end_date, stride",
+    [
+        ("2012-11-19 01:00", "2012-11-19 03:05", 1),
+        ("2012-11-19 01:01", "2012-11-19 03:00", 3),
+        (None, "2012-11-19 02:00", 2),
+        ("2012-11-19 10:00", None, 5),
+    ],
+)
+def test_extract_date_range(start_date, end_date, stride):
+    # Act
+    result = extract(
+        "tests/frutal.out",
+        [["link", "222", "Flow_rate"]],
+        start_date=start_date,
+        end_date=end_date,
+        stride=stride,
+    )
+    result.index.name = "Datetime"
+
+    # Assert
+    expected = extract_link[start_date:end_date].iloc[::stride]
+    pd.testing.assert_frame_equal(result, expected)
+
+
+def test_extract_reuses_dates(monkeypatch):
+    obj = SwmmExtract("tests/frutal.out")
+    first = extract(obj, [["link", "222", "Flow_rate"]])
+    assert obj._dates is not None
+
+    # Act
+    monkeypatch.setattr(obj, "_raw_dates", lambda: pytest.fail("dates re-read"))
+    second = extract(obj, [["node", 222, "Hydraulic_head"]])
+
+    # Assert
+    pd.testing.assert_index_equal(second.index, first.index)
+
+
+@pytest.mark.parametrize("chunksize", [1, 7, 1000])
+def test_extract_chunks(chunksize):
+    # Act
+    result = pd.concat(
+        extract_chunks(
+            "tests/frutal.out",
+            [["link", "222", "Flow_rate"], ["node", 222, "Hydraulic_head"]],
+            chunksize=chunksize,
+        )
+    )
+    result.index.name = "Datetime"
+
+    # Assert
+    pd.testing.assert_frame_equal(result, extract_link.join(extract_node))
+
+
+def test_extract_command_line_chunksize():
+    # Act
+    args = shlex.split(
+        "swmmtoolbox extract tests/frutal.out link,222,Flow_rate --chunksize=7"
+    )
+    complete = subprocess.run(args, capture_output=True, text=True, check=True)
+    result = pd.read_csv(StringIO(complete.stdout), index_col=0, parse_dates=True)
+
+    # Assert
+    pd.testing.assert_frame_equal(result, extract_link)
+
+
+@pytest.mark.parametrize("executor", ["thread", "process"])
+@pytest.mark.parametrize("partition", ["periods", "labels"])
+def test_extract_workers(executor, partition):
+    labels = ["link,,Flow_rate", "node,,Hydraulic_head"]
+
+    # Act
+    result = extract(
+        "tests/frutal.out",
+        labels,
+        stride=2,
+        workers=3,
+        executor=executor,
+        partition=partition,
+    )
+
+    # Assert
+    pd.testing.assert_frame_equal(result, extract("tests/frutal.out", labels, stride=2))
+
+
+@pytest.mark.parametrize("source", ["bytes", "bytesio", "file", "swmmextract"])
+def test_extract_open_sources(source):
+    with open("tests/frutal.out", "rb") as fpo:
+        data = fpo.read()
+    with open("tests/frutal.out", "rb") as fpo:
+        filename = {
+            "bytes": data,
+            "bytesio": BytesIO(data),
+            "file": fpo,
+            "swmmextract": SwmmExtract("tests/frutal.out"),
+        }[source]
+
+        # Act
+        result = extract(filename, [["link", "222", "Flow_rate"]])
+        result.index.name = "Datetime"
+
+    # Assert
+    pd.testing.assert_frame_equal(result, extract_link)
+
+
+@pytest.mark.parametrize("workers", [None, 2])
+def test_extract_ensemble(tmp_path, workers):
+    for number in range(3):
+        shutil.copy("tests/frutal.out", tmp_path / f"run{number}.out")
+    labels = [["link", "222", "Flow_rate"], ["node", 222, "Hydraulic_head"]]
+
+    # Act
+    result = extract_ensemble(
+        str(tmp_path / "run*.out"),
+        *labels,
+        start_date="2012-11-19 01:00",
+        stride=2,
+        workers=workers,
+    )
+
+    # Assert
+    expected = extract(
+        "tests/frutal.out", *labels, start_date="2012-11-19 01:00", stride=2
+    )
+    assert result.data.shape == (3, len(expected), 2)
+    assert list(result.columns) == list(expected.columns)
+    assert [str(i) for i in result.filenames] == [
+        str(tmp_path / f"run{number}.out") for number in range(3)
+    ]
+    np.testing.assert_array_equal(result.index, expected.index)
+    for data in result.data:
+        np.testing.assert_array_equal(data, expected.values)
+
+
+def test_extract_ensemble_system_label(tmp_path):
+    # System labels never read the names of the reference file.
+    for number in range(2):
+        shutil.copy("tests/frutal.out", tmp_path / f"run{number}.out")
+
+    # Act
+    result = extract_ensemble(str(tmp_path / "run*.out"), "system,,Rainfall")
+
+    # Assert
+    expected = extract("tests/frutal.out", "system,,Rainfall")
+    assert result.data.shape == (2, len(expected), 1)
+    for data in result.data:
+        np.testing.assert_array_equal(data, expected.values)
+
+
+def test_extract_ensemble_layout_mismatch(tmp_path):
+    with open("tests/frutal.out", "rb") as fpo:
+        data = bytearray(fpo.read())
+    # Rename the first subcatchment.
+    data[32] = ord("X")
+    (tmp_path / "changed.out").write_bytes(data)
+
+    # Act, Assert
+    with pytest.raises(ValueError, match="names"):
+        extract_ensemble(
+            ["tests/frutal.out", tmp_path / "changed.out"], "link,222,Flow_rate"
+        )
+
+
+@pytest.mark.parametrize("chunksize", [None, 7])
+def test_summarize(chunksize):
+    labels = ["link,,Flow_rate", "node,,Hydraulic_head"]
+    expected = extract("tests/frutal.out", labels, start_date="2012-11-19 02:00")
+
+    # Act
+    result = summarize(
+        "tests/frutal.out",
+        labels,
+        start_date="2012-11-19 02:00",
+        threshold=0.1,
+        chunksize=chunksize,
+    )
+
+    # Assert
+    assert list(result.index) == list(expected.columns)
+    np.testing.assert_allclose(result["minimum"], expected.min())
+    np.testing.assert_allclose(result["maximum"], expected.max())
+    np.testing.assert_array_equal(result["maximum_time"], expected.idxmax())
+    np.testing.assert_allclose(result["mean"], expected.mean(), rtol=1e-6)
+    np.testing.assert_allclose(result["total"], expected.sum() * 600, rtol=1e-6)
+    np.testing.assert_allclose(
+        result["hours_above"], (expected > 0.1).sum() * 600 / 3600
+    )
+
+
+def test_summarize_date_range(monkeypatch):
+    obj = SwmmExtract("tests/frutal.out")
+    labels = ["link,,Flow_rate"]
+    expected = extract(
+        "tests/frutal.out",
+        labels,
+        start_date="2012-11-19 03:00",
+        end_date="2012-11-19 09:00",
+        stride=4,
+    )
+    decoded = []
+
+    def decode_dates(rdates):
+        decoded.append(len(rdates))
+        return _decode_dates(rdates)
+
+    monkeypatch.setattr(swmmtoolbox, "_decode_dates", decode_dates)
+
+    # Act
+    result = summarize(
+        obj,
+        labels,
+        start_date="2012-11-19 03:00",
+        end_date="2012-11-19 09:00",
+        stride=4,
+        chunksize=5,
+    )
+
+    # Assert
+    np.testing.assert_array_equal(result["maximum_time"], expected.idxmax())
+    # Only the dates of the maxima were decoded.
+    assert obj._dates is None
+    assert decoded == [len(result)]
+
+
+def test_summarize_command_line():
+    # Act
+    args = shlex.split(
+        "swmmtoolbox summarize tests/frutal.out link,222,Flow_rate --threshold=0.1"
+    )
+    complete = subprocess.run(args, capture_output=True, text=True, check=True)
+    result = pd.read_csv(StringIO(complete.stdout), index_col=0)
+
+    # Assert
+    assert list(result.index) == ["link_222_Flow_rate"]
+    assert result.loc["link_222_Flow_rate", "maximum"] == pytest.approx(
+        extract_link.iloc[:, 0].max(), rel=1e-5
+    )
+
+
+@pytest.mark.parametrize(
+    "itemtype, variable, time, row",
+    [
+        ("node", "Hydraulic_head", "2012-11-19 14:35", "2012-11-19 14:30"),
+        ("link", "", "2012-11-19 00:10", "2012-11-19 00:10"),
+        ("system", "Rainfall", "2012-11-19 20:00", "2012-11-19 20:00"),
+    ],
+)
+def test_snapshot(itemtype, variable, time, row):
+    # Act
+    result = snapshot("tests/frutal.out", itemtype, variable, time)
+
+    # Assert
+    expected = extract("tests/frutal.out", f"{itemtype},,{variable}").loc[row]
+    np.testing.assert_array_equal(result.to_numpy().ravel(), expected.to_numpy())
+    if itemtype == "system":
+        assert list(result.index) == ["system"]
+    else:
+        names = [i[1] for i in catalog("tests/frutal.out", itemtype)]
+        assert list(result.index) == list(dict.fromkeys(names))
+
+
+@pytest.mark.parametrize("itemtype", ["", "pollutant"])
+def test_snapshot_itemtype(itemtype):
+    with pytest.raises(ValueError, match="must be one of"):
+        snapshot("tests/frutal.out", itemtype, "", "2012-11-19 14:35")
+
+
+@pytest.mark.parametrize("time", ["2012-11-19 00:05", "2012-11-19 20:10"])
+def test_snapshot_out_of_range(time):
+    with pytest.raises(ValueError, match="outside of the reported periods"):
+        snapshot("tests/frutal.out", "node", "Hydraulic_head", time)
+
+
+def test_iter_frames():
+    # Act
+    frames = [
+        (date, {key: value.copy() for key, value in frame.items()})
+        for date, frame in iter_frames(
+            "tests/frutal.out", start_date="2012-11-19 14:00", stride=5
+        )
+    ]
+
+    # Assert
+    expected = extract_node["2012-11-19 14:00":].iloc[::5]
+    assert [i[0] for i in frames] == list(expected.index)
+    assert list(frames[0][1]) == ["subcatchment", "node", "link", "system"]
+    obj = SwmmExtract("tests/frutal.out")
+    row = obj.names[1].index("222")
+    column = obj.variable_index[1]["Hydraulic_head"]
+    np.testing.assert_allclose(
+        [i[1]["node"][row, column] for i in frames], expected.iloc[:, 0], rtol=1e-6
+    )
+    for date, frame in frames:
+        for itemtype in ["node", "link", "system"]:
+            np.testing.assert_array_equal(
+                frame[itemtype],
+                snapshot("tests/frutal.out", itemtype, "", date).to_numpy(),
+            )
+
+
+def test_iter_frames_reuses_buffer():
+    # Act
+    frames = iter_frames("tests/frutal.out", "link")
+    first = next(frames)[1]["link"]
+    values = first.copy()
+    second = next(frames)[1]["link"]
+
+    # Assert
+    assert second is first
+    assert not np.array_equal(second, values)
+
+
+@pytest.mark.parametrize("output_format", ["csv", "npz", "parquet", "feather"])
+def test_extract_command_line_output_format(tmp_path, output_format):
+    if output_format in ("parquet", "feather"):
+        pytest.importorskip("pyarrow")
+    output = tmp_path / f"extract.{output_format}"
+    args = shlex.split(
+        "swmmtoolbox extract tests/frutal.out link,222,Flow_rate "
+        f"node,222,Hydraulic_head --chunksize=7 --output_format={output_format} "
+        f"--output={output}"
+    )
+
+    # Act
+    subprocess.run(args, capture_output=True, text=True, check=True)
+
+    # Assert
+    expected = extract(
+        "tests/frutal.out", "link,222,Flow_rate", "node,222,Hydraulic_head"
+    )
+    if output_format == "csv":
+        result = pd.read_csv(output, index_col=0, parse_dates=True)
+        pd.testing.assert_frame_equal(result, extract_link.join(extract_node))
+        return
+    if output_format == "npz":
+        with np.load(output) as data:
+            result = pd.DataFrame(
+                data["values"], index=data["dates"], columns=data["columns"]
+            )
+    elif output_format == "parquet":
+        result = pd.read_parquet(output).set_index("Datetime")
+    else:
+        result = pd.read_feather(output).set_index("Datetime")
+    pd.testing.assert_frame_equal(
+        result.astype("float64"), expected, check_names=False, check_freq=False
+    )
+
+
+def test_catalog_command_line_output_format(tmp_path):
+    output = tmp_path / "catalog.npz"
+    args = shlex.split(
+        "swmmtoolbox catalog tests/frutal.out --itemtype=node --output_format=npz "
+        f"--output={output}"
+    )
+
+    # Act
+    subprocess.run(args, capture_output=True, text=True, check=True)
+
+    # Assert
+    with np.load(output) as data:
+        result = np.column_stack([data["TYPE"], data["NAME"], data["VARIABLE"]])
+    assert result.tolist() == catalog("tests/frutal.out", "node")
+
+
+@pytest.mark.parametrize(
+    "label", ["link,222,Not_a_variable", "node,not_a_node,", "link,,Hydraulic_head"]
+)
+def test_extract_no_match(label):
+    with pytest.raises(ValueError, match="does not match anything"):
+        extract("tests/frutal.out", label)
+
+
+@pytest.mark.parametrize("output_format", ["csv", "npz", "parquet", "feather"])
+def test_extract_command_line_output_format_empty(tmp_path, output_format):
+    if output_format in ("parquet", "feather"):
+        pytest.importorskip("pyarrow")
+    output = tmp_path / f"extract.{output_format}"
+    args = shlex.split(
+        "swmmtoolbox extract tests/frutal.out link,222,Flow_rate "
+        f"--start_date=2013-01-01 --output_format={output_format} "
+        f"--output={output}"
+    )
+
+    # Act
+    subprocess.run(args, capture_output=True, text=True, check=True)
+
+    # Assert
+    if output_format == "csv":
+        result = pd.read_csv(output, index_col=0)
+    elif output_format == "npz":
+        with np.load(output) as data:
+            assert data["values"].shape == (0, 1)
+            assert data["dates"].dtype.kind == "M"
+            result = pd.DataFrame(data["values"], columns=data["columns"])
+    elif output_format == "parquet":
+        result = pd.read_parquet(output).set_index("Datetime")
+    else:
+        result = pd.read_feather(output).set_index("Datetime")
+    assert result.empty
+    assert list(result.columns) == ["link_222_Flow_rate"]
+
+
+def test_output_options_only_documented_on_command_line():
+    assert "output_format" not in extract.__doc__
+    assert "output_format" not in catalog.__doc__
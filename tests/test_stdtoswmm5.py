@@ -0,0 +1,124 @@
+"""
+test_stdtoswmm5
+----------------------------------
+
+Tests for the `stdtoswmm5` conversion.
+"""
+
+import shlex
+import subprocess
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from swmmtoolbox.swmmtoolbox import stdtoswmm5
+
+index = pd.date_range("1999-12-31 23:00", periods=50, freq="15min")
+tsd = pd.DataFrame(
+    {
+        "gauge1": np.arange(50) / 4,
+        "gauge2": np.arange(50, 0, -1, dtype="float64"),
+    },
+    index=pd.Index(index, name="Datetime"),
+)
+
+
+def swmm5_lines(frame):
+    return [
+        " ".join([f"{date:%m/%d/%Y %H:%M:%S}", *(f"{i:g}" for i in row)])
+        for date, row in zip(frame.index, frame.to_numpy())
+    ]
+
+
+@pytest.fixture
+def input_ts(tmp_path):
+    filename = tmp_path / "input.csv"
+    tsd.to_csv(filename)
+    return str(filename)
+
+
+@pytest.mark.parametrize("stream", [False, True])
+@pytest.mark.parametrize("chunksize", [None, 7])
+@pytest.mark.parametrize(
+    "start_date, end_date",
+    [(None, None), ("2000-01-01 01:00", "2000-01-01 03:30")],
+)
+def test_stdtoswmm5(input_ts, capsys, chunksize, start_date, end_date, stream):
+    # Act
+    stdtoswmm5(
+        start_date=start_date,
+        end_date=end_date,
+        input_ts=input_ts,
+        chunksize=chunksize,
+        stream=stream,
+    )
+
+    # Assert
+    lines = capsys.readouterr().out.splitlines()
+    assert lines[0] == ";Datetime, gauge1, gauge2"
+    assert lines[1:] == swmm5_lines(tsd[start_date:end_date])
+
+
+def test_stdtoswmm5_outdir(input_ts, tmp_path):
+    outdir = tmp_path / "gauges"
+
+    # Act
+    stdtoswmm5(input_ts=input_ts, outdir=str(outdir), chunksize=9)
+
+    # Assert
+    for column in tsd.columns:
+        lines = (outdir / f"{column}.dat").read_text().splitlines()
+        assert lines[0] == f";Datetime, {column}"
+        assert lines[1:] == swmm5_lines(tsd[[column]])
+
+
+def test_stdtoswmm5_outdir_different_time_stamps(tmp_path):
+    filename = tmp_path / "input.csv"
+    gauges = pd.concat(
+        [tsd["gauge1"].iloc[::2], tsd["gauge2"].iloc[1::3]],
+        axis="columns",
+        sort=True,
+    )
+    gauges.to_csv(filename)
+    outdir = tmp_path / "gauges"
+
+    # Act
+    stdtoswmm5(input_ts=str(filename), outdir=str(outdir), chunksize=9)
+
+    # Assert
+    for column in gauges.columns:
+        lines = (outdir / f"{column}.dat").read_text().splitlines()
+        assert lines[1:] == swmm5_lines(gauges[[column]].dropna())
+
+
+def test_stdtoswmm5_stream_stops_at_end_date(input_ts):
+    # Rows after "end_date" that could not be parsed are never read.
+    with open(input_ts, "a") as fpo:
+        fpo.write("not a date,x,y\n" * 1000)
+    with open(input_ts) as fpi:
+        args = shlex.split(
+            "swmmtoolbox stdtoswmm5 --stream --chunksize=7 "
+            "--start_date='2000-01-01 01:00' --end_date='2000-01-01 03:30'"
+        )
+
+        # Act
+        complete = subprocess.run(
+            args, stdin=fpi, capture_output=True, text=True, check=True
+        )
+
+    # Assert
+    lines = complete.stdout.splitlines()
+    assert lines[0] == ";Datetime, gauge1, gauge2"
+    assert lines[1:] == swmm5_lines(tsd["2000-01-01 01:00":"2000-01-01 03:30"])
+
+
+@pytest.mark.parametrize("column", [",1", None])
+def test_stdtoswmm5_stream_input_ts(input_ts, column):
+    input_ts = tsd if column is None else input_ts + column
+    with pytest.raises(ValueError, match="must be '-' or the filename"):
+        stdtoswmm5(input_ts=input_ts, stream=True)
+
+
+def test_stdtoswmm5_docstring():
+    assert "${" not in stdtoswmm5.__doc__
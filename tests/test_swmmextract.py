@@ -0,0 +1,231 @@
+"""
+test_swmmextract
+----------------------------------
+
+Tests for the `SwmmExtract` class.
+"""
+
+import os
+import shutil
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from swmmtoolbox import swmmtoolbox
+from swmmtoolbox.swmmtoolbox import SwmmExtract, catalog, tuple_search
+
+frutal = "tests/frutal.out"
+
+
+@pytest.mark.parametrize(
+    "label",
+    [
+        ("link", "", "Flow_rate"),
+        ("", "", "Rainfall"),
+        ("system", "", ""),
+        ("", "222", ""),
+        ("node", "222", "Hydraulic_head"),
+    ],
+)
+def test_resolve_label_matches_catalog(label):
+    obj = SwmmExtract(frutal)
+    result = [i[:3] for i in obj.resolve_label(*label)]
+    expected = [tuple(i) for i in tuple_search(list(label), catalog(frutal))]
+    assert result == expected
+
+
+def test_resolve_label_read_errors():
+    # Errors reading the header are not mistaken for a missing variable.
+    obj = SwmmExtract(frutal)
+    obj.close()
+    with pytest.raises(ValueError, match="closed file"):
+        obj.resolve_label("", "", "Flow_rate")
+
+
+def test_metadata_cache(tmp_path, monkeypatch):
+    fname = tmp_path / "frutal.out"
+    shutil.copy(frutal, fname)
+    cachedir = tmp_path / "cache"
+
+    reads = []
+    read_header = SwmmExtract._read_header
+
+    def counted_read_header(self):
+        reads.append(self.filename)
+        read_header(self)
+
+    monkeypatch.setattr(SwmmExtract, "_read_header", counted_read_header)
+
+    first = SwmmExtract(str(fname), cache=str(cachedir))
+    assert len(list(cachedir.iterdir())) == 1
+    second = SwmmExtract(str(fname), cache=str(cachedir))
+    assert len(reads) == 1
+    for attr in ("names", "varcode", "vars", "propcode", "startdate"):
+        assert getattr(first, attr) == getattr(second, attr)
+    for typenumber, prop in first.prop.items():
+        np.testing.assert_array_equal(prop, second.prop[typenumber])
+    pd.testing.assert_index_equal(first.dates, second.dates)
+
+    # A rewritten file must not use the stale cache.
+    stat = os.stat(fname)
+    os.utime(fname, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    SwmmExtract(str(fname), cache=str(cachedir))
+    assert len(reads) == 2
+
+
+def test_metadata_cache_unusable_directory(tmp_path):
+    # A cache directory that cannot be created means no cache.
+    blocker = tmp_path / "file"
+    blocker.write_text("")
+    obj = SwmmExtract(frutal, cache=str(blocker / "cache"))
+    assert obj.names[1][:2] == ["43", "44"]
+
+
+def test_lazy_header_sections():
+    obj = SwmmExtract(frutal)
+    assert "_id_section" not in obj.__dict__
+    assert "_property_section" not in obj.__dict__
+
+    # System variables resolve without reading any names or properties.
+    obj.resolve_label("system", "", "Rainfall")
+    assert "_id_section" not in obj.__dict__
+    assert "_property_section" not in obj.__dict__
+
+    assert obj.names[1][:2] == ["43", "44"]
+    assert "_id_section" in obj.__dict__
+    assert "_property_section" not in obj.__dict__
+
+
+def test_context_manager():
+    with SwmmExtract(frutal) as obj:
+        assert not obj.fpb.closed
+    assert obj.fpb.closed
+
+
+def test_reader_pool(tmp_path, monkeypatch):
+    monkeypatch.setenv("SWMMTOOLBOX_POOL_SIZE", "2")
+    swmmtoolbox.clear_pool()
+    fnames = []
+    for i in range(3):
+        fnames.append(str(tmp_path / f"frutal{i}.out"))
+        shutil.copy(frutal, fnames[-1])
+
+    first = swmmtoolbox._open(fnames[0])
+    assert swmmtoolbox._open(fnames[0]) is first
+    swmmtoolbox.extract(fnames[1], "node,222,Hydraulic_head")
+    swmmtoolbox.catalog(fnames[2])
+    assert len(swmmtoolbox._POOL) == 2
+    # Dropped from the pool, but not closed while still in use.
+    assert first not in [i[1] for i in swmmtoolbox._POOL.values()]
+    assert not first.closed
+    assert swmmtoolbox.catalog(first)
+    fpb = first.fpb
+    del first
+    assert fpb.closed
+
+    swmmtoolbox.clear_pool()
+    assert not swmmtoolbox._POOL
+
+
+def test_live_extract(tmp_path):
+    with open(frutal, "rb") as fpo:
+        data = fpo.read()
+    complete = SwmmExtract(frutal)
+    startpos = complete.startpos
+    bytesperperiod = complete.bytesperperiod
+    live = tmp_path / "live.out"
+
+    # Header not completely written yet.
+    live.write_bytes(data[: startpos - 5])
+    with pytest.raises(EOFError):
+        swmmtoolbox.SwmmLiveExtract(str(live))
+
+    # Ten and a half periods written.
+    live.write_bytes(data[: startpos + 10 * bytesperperiod + bytesperperiod // 2])
+    with swmmtoolbox.SwmmLiveExtract(str(live)) as obj:
+        assert obj.startpos == startpos
+        assert obj.offset0 == complete.offset0
+        assert obj.swmm_nperiods == 10
+        assert not obj.finished
+        assert obj.names == complete.names
+
+        # The rest of the run and the footer.
+        live.write_bytes(data)
+        assert obj.refresh() == complete.swmm_nperiods - 10
+        assert obj.finished
+        assert obj.errcode == 0
+        np.testing.assert_array_equal(
+            obj.get_swmm_values([0, 463]), complete.get_swmm_values([0, 463])
+        )
+
+
+def test_follow(tmp_path):
+    with open(frutal, "rb") as fpo:
+        data = fpo.read()
+    complete = SwmmExtract(frutal)
+    live = tmp_path / "live.out"
+    live.write_bytes(data[: complete.startpos + 3 * complete.bytesperperiod])
+    label = "node,222,Hydraulic_head"
+
+    # Act
+    chunks = swmmtoolbox.follow(str(live), label, poll_interval=0.01)
+    first = next(chunks)
+    with open(live, "ab") as fpo:
+        fpo.write(data[complete.startpos + 3 * complete.bytesperperiod :])
+    rest = list(chunks)
+
+    # Assert
+    assert len(first) == 3
+    pd.testing.assert_frame_equal(
+        pd.concat([first, *rest]), swmmtoolbox.extract(frutal, label)
+    )
+
+
+def test_follow_timeout(tmp_path):
+    with open(frutal, "rb") as fpo:
+        data = fpo.read()
+    complete = SwmmExtract(frutal)
+    live = tmp_path / "live.out"
+    live.write_bytes(data[: complete.startpos + 5 * complete.bytesperperiod])
+
+    # Act
+    result = list(
+        swmmtoolbox.follow(
+            str(live), "system,,Rainfall", poll_interval=0.01, timeout=0.05
+        )
+    )
+
+    # Assert
+    assert [len(i) for i in result] == [5]
+
+
+def test_reader_pool_threads(tmp_path, monkeypatch):
+    monkeypatch.setenv("SWMMTOOLBOX_POOL_SIZE", "8")
+    swmmtoolbox.clear_pool()
+    fnames = []
+    for i in range(20):
+        fnames.append(str(tmp_path / f"frutal{i}.out"))
+        shutil.copy(frutal, fnames[-1])
+    label = "node,222,Hydraulic_head"
+    expected_extract = swmmtoolbox.extract(frutal, label)
+    expected_listdetail = swmmtoolbox.listdetail(frutal, "node")
+
+    def work(number):
+        fname = fnames[number * 7 % len(fnames)]
+        if number % 2:
+            pd.testing.assert_frame_equal(
+                swmmtoolbox.extract(fname, label), expected_extract
+            )
+        else:
+            pd.testing.assert_frame_equal(
+                swmmtoolbox.listdetail(fname, "node"), expected_listdetail
+            )
+
+    # Act, Assert
+    with ThreadPoolExecutor(max_workers=16) as pool:
+        list(pool.map(work, range(600)))
+    # The per path locks are only kept while a path is being opened.
+    assert not swmmtoolbox._POOL_OPENING
+    swmmtoolbox.clear_pool()
@@ -0,0 +1,156 @@
+"""
+test_writer
+----------------------------------
+
+Tests for writing SWMM output files with `SwmmWriter`.
+"""
+
+import datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from swmmtoolbox import swmmtoolbox
+from swmmtoolbox.swmmtoolbox import SwmmExtract, SwmmWriter
+
+frutal = "tests/frutal.out"
+
+
+def test_writer_round_trip(tmp_path):
+    filename = tmp_path / "copy.out"
+    obj = SwmmExtract(frutal)
+
+    # Act
+    with SwmmWriter(
+        filename,
+        obj.names,
+        obj.vars,
+        obj.startdate,
+        obj.reportinterval,
+        propcode=obj.propcode,
+        prop=obj.prop,
+        pollutant_codes=obj.pollutant_codes,
+        version=obj.version,
+        flowunits=obj.swmm_flowunits,
+    ) as writer:
+        for block in obj.period_blocks(chunksize=17):
+            records = obj.results[block.start : block.stop]
+            writer.write(records["values"], dates=records["date"])
+
+    # Assert
+    with open(frutal, "rb") as fpo:
+        assert filename.read_bytes() == fpo.read()
+
+
+def test_writer_dataframe(tmp_path):
+    filename = str(tmp_path / "new.out")
+    names = {0: ["S1"], 1: ["J1", "J2"], 2: ["C1"], 3: []}
+    variables = {0: [0, 4], 1: [0, 1], 2: [0], 4: [0, 1]}
+    index = pd.date_range("2020-01-01 00:05", periods=10, freq="5min")
+    values = pd.DataFrame(np.arange(90, dtype="f4").reshape(10, 9), index=index)
+
+    # Act
+    with SwmmWriter(
+        filename,
+        names,
+        variables,
+        datetime.datetime(2020, 1, 1),
+        300,
+        propcode={1: [0, 2]},
+        prop={1: [[0, 10.5], [0, 9.5]]},
+    ) as writer:
+        writer.write(values.iloc[:4])
+        writer.write(values.iloc[4:].to_numpy())
+
+    # Assert
+    result = swmmtoolbox.extract(filename, "node,,", "system,,")
+    assert list(result.columns) == [
+        "node_J1_Depth_above_invert",
+        "node_J1_Hydraulic_head",
+        "node_J2_Depth_above_invert",
+        "node_J2_Hydraulic_head",
+        "system__Air_temperature",
+        "system__Rainfall",
+    ]
+    pd.testing.assert_index_equal(result.index, index)
+    np.testing.assert_array_equal(
+        result.to_numpy(), values.iloc[:, [2, 3, 4, 5, 7, 8]].to_numpy()
+    )
+    assert SwmmExtract(filename).prop[1].tolist() == [[0, 10.5], [0, 9.5]]
+
+
+def test_writer_wrong_number_of_values(tmp_path):
+    with (
+        SwmmWriter(
+            tmp_path / "new.out", {1: ["J1"]}, {1: [0, 1], 4: [0]}, 0.0, 60
+        ) as writer,
+        pytest.raises(ValueError, match="must have 3 values"),
+    ):
+        writer.write(np.zeros((2, 4)))
+
+
+def test_writer_error_marks_the_run_failed(tmp_path):
+    filename = tmp_path / "new.out"
+
+    # Act
+    with (
+        pytest.raises(RuntimeError),
+        SwmmWriter(filename, {1: ["J1"]}, {1: [0, 1], 4: [0]}, 0.0, 60) as writer,
+    ):
+        writer.write(np.zeros((3, 3)))
+        raise RuntimeError("simulated failure")
+
+    # Assert
+    with pytest.raises(ValueError, match='Error code "1"'):
+        SwmmExtract(filename)
+
+
+@pytest.mark.parametrize(
+    "start_date, end_date, stride, chunksize",
+    [
+        (None, None, 1, None),
+        ("2012-11-19 01:05", "2012-11-19 15:00", 3, 7),
+    ],
+)
+def test_subset(tmp_path, start_date, end_date, stride, chunksize):
+    filename = str(tmp_path / "subset.out")
+    labels = [
+        "node,222,Hydraulic_head",
+        "node,43,",
+        "link,,Flow_rate",
+        "system,,Rainfall",
+    ]
+
+    # Act
+    swmmtoolbox.subset(
+        frutal,
+        filename,
+        labels,
+        start_date=start_date,
+        end_date=end_date,
+        stride=stride,
+        chunksize=chunksize,
+    )
+
+    # Assert
+    obj = SwmmExtract(filename)
+    assert obj.names[1] == ["43", "222"]
+    assert obj.names[2] == SwmmExtract(frutal).names[2]
+    assert obj.names[3] == SwmmExtract(frutal).names[3]
+    assert [i[1:] for i in swmmtoolbox.catalog(filename, "system")] == [
+        ["Rainfall", "Rainfall"]
+    ]
+    expected = swmmtoolbox.listdetail(frutal, "node")
+    pd.testing.assert_frame_equal(
+        swmmtoolbox.listdetail(filename, "node"),
+        expected[expected["#Name"].isin(["43", "222"])].reset_index(drop=True),
+    )
+    pd.testing.assert_frame_equal(
+        swmmtoolbox.extract(filename, labels),
+        swmmtoolbox.extract(
+            frutal, labels, start_date=start_date, end_date=end_date, stride=stride
+        ),
+        check_freq=False,
+    )
+    assert obj.reportinterval == SwmmExtract(frutal).reportinterval * stride